@@ -12,11 +12,6 @@ from .utils import mediainfo_json, fsdecode
 import base64
 from collections import namedtuple
 
-try:
-    from StringIO import StringIO
-except:
-    from io import StringIO
-
 from io import BytesIO
 
 try:
@@ -24,6 +19,16 @@ try:
 except:
     izip = zip
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
 from .utils import (
     _fd_or_path_or_tempfile,
     db_to_float,
@@ -42,10 +47,14 @@ from .exceptions import (
     MissingAudioParameter,
 )
 
+# audioop accepts any bytes-like object on python 3, so slices of raw data
+# that are only read by audioop can come from a memoryview without copying
 if sys.version_info >= (3, 0):
     basestring = str
     xrange = range
-    StringIO = BytesIO
+    _data_view = memoryview
+else:
+    _data_view = bytes
 
 
 class ClassPropertyDescriptor(object):
@@ -84,6 +93,29 @@ AUDIO_FILE_EXT_ALIASES = {
     "wave": "wav",
 }
 
+# every possible 8-bit sample
+_ALL_BYTES = bytes(bytearray(range(256)))
+
+# positions of float('inf') mean "the end of the segment"
+_INF = float('inf')
+
+# canonical 44 byte header of a PCM wav file
+_WAV_HEADER = struct.Struct('<4sL4s4sLHHLLHH4sL')
+
+# precompiled packers for the pure python 24-bit to 32-bit conversion, and
+# the padding byte to use for each possible value of a sample's high byte
+_PACK_BBBB = struct.Struct('BBBB').pack
+_PACK_CCCC = struct.Struct('cccc').pack
+_SIGN_PAD = b'\x00' * 0x80 + b'\xFF' * 0x80
+
+# the numpy sample type and its (min, max) for each sample width the numpy
+# kernels handle, worked out once instead of on every call
+if np is not None:
+    _SAMPLE_DTYPES = dict((width, np.dtype(get_array_type(width * 8)))
+                          for width in (1, 2, 4))
+    _SAMPLE_LIMITS = dict((dtype, (np.iinfo(dtype).min, np.iinfo(dtype).max))
+                          for dtype in _SAMPLE_DTYPES.values())
+
 WavSubChunk = namedtuple('WavSubChunk', ['id', 'position', 'size'])
 WavData = namedtuple('WavData', ['audio_format', 'channels', 'sample_rate',
                                  'bits_per_sample', 'raw_data'])
@@ -105,8 +137,34 @@ def extract_wav_headers(data):
     return subchunks
 
 
+def _read_canonical_wav_audio(data):
+    """
+    Reads wav data laid out with the canonical 44 byte header (a 16 byte
+    'fmt ' chunk immediately followed by 'data') in a single unpack. Returns
+    None when the data is laid out any other way.
+    """
+    if len(data) < _WAV_HEADER.size:
+        return None
+
+    (riff, _, wave, fmt_id, fmt_size, audio_format, channels, sample_rate,
+     _, _, bits_per_sample, data_id, data_size) = _WAV_HEADER.unpack_from(data)
+    if (riff, wave, fmt_id, fmt_size, data_id) != (b'RIFF', b'WAVE', b'fmt ', 16, b'data'):
+        return None
+
+    if audio_format != 1 and audio_format != 0xFFFE:
+        raise CouldntDecodeError("Unknown audio format 0x%X in wav data" %
+                                 audio_format)
+
+    pos = _WAV_HEADER.size
+    return WavData(audio_format, channels, sample_rate, bits_per_sample,
+                   data[pos:pos + data_size])
+
+
 def read_wav_audio(data, headers=None):
     if not headers:
+        wav_data = _read_canonical_wav_audio(data)
+        if wav_data is not None:
+            return wav_data
         headers = extract_wav_headers(data)
 
     fmt = [x for x in headers if x.id == b'fmt ']
@@ -149,6 +207,184 @@ def fix_wav_headers(data):
     data[pos + 4:pos + 8] = struct.pack('<I', len(data) - pos - 8)
 
 
+# numpy releases the GIL while it works, so large buffers can be processed in
+# chunks on several threads (audioop holds the GIL, so it can't be split up)
+_PARALLEL_MIN_BYTES = 1 << 22
+_executor = None
+
+# without a C audioop, utils falls back to the pure python pyaudioop, which
+# the numpy kernels here beat even on one thread
+_PURE_AUDIOOP = audioop.__name__.endswith('pyaudioop')
+
+
+def _in_parallel(fn, data, align):
+    """
+    Calls fn on chunks of data (aligned to align bytes) on a thread pool and
+    joins the results, or just returns fn(data) when that isn't worthwhile.
+    """
+    executor = _thread_pool(len(data))
+    if executor is None:
+        return fn(data)
+
+    step = -(-len(data) // _cpu_count())
+    step += -step % align
+    view = _data_view(data)
+    chunks = [view[i:i + step] for i in range(0, len(data), step)]
+    return b''.join(executor.map(fn, chunks))
+
+
+def _thread_pool(size):
+    """
+    Returns the shared thread pool when there's more than one cpu and size
+    bytes of work is enough to be worth splitting up, otherwise None.
+    """
+    global _executor
+
+    if ThreadPoolExecutor is None or _cpu_count() < 2 or size < _PARALLEL_MIN_BYTES:
+        return None
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(_cpu_count())
+    return _executor
+
+
+def _cpu_count():
+    return getattr(os, 'cpu_count', lambda: 1)() or 1
+
+
+def _write_chunks(f, chunks):
+    """
+    Writes chunks to the file object f with a single os.writev() call (as
+    many as it takes for partial writes) when the platform has it.
+    """
+    if not hasattr(os, 'writev'):
+        for chunk in chunks:
+            f.write(chunk)
+        return
+
+    f.flush()
+    fd = f.fileno()
+    views = [memoryview(chunk) for chunk in chunks]
+    while views:
+        written = os.writev(fd, views)
+        while views and written >= len(views[0]):
+            written -= len(views[0])
+            views.pop(0)
+        if views:
+            views[0] = views[0][written:]
+
+
+def _mul(data, sample_width, factor):
+    """
+    Same as audioop.mul(), but vectorized with numpy when it is available.
+    Samples are multiplied in double precision, floored and clipped to the
+    sample range just like audioop does, so the output is identical.
+    """
+    if isinstance(data, bytes):
+        # unity gain leaves every sample as it is
+        if factor == 1:
+            return data
+
+        # 8-bit audio only has 256 possible sample values, so scale each of
+        # them once and map the data through the resulting table
+        if sample_width == 1:
+            return data.translate(audioop.mul(_ALL_BYTES, 1, factor))
+
+    if np is None or sample_width == 3:
+        return audioop.mul(data, sample_width, factor)
+
+    dtype = _SAMPLE_DTYPES[sample_width]
+    factor = float(factor)
+    return _in_parallel(
+        lambda chunk: _scale_samples(np.frombuffer(chunk, dtype=dtype), factor),
+        data, sample_width)
+
+
+# rows of samples scaled at a time, small enough that the float temporaries
+# stay in cache between the multiply, floor, clip and narrowing steps
+_SCALE_BLOCK = 1 << 15
+
+
+def _scale_samples(samples, factor):
+    """
+    The numpy half of _mul(). factor may also be an array that broadcasts
+    against samples, e.g. one gain per frame.
+    """
+    low, high = _SAMPLE_LIMITS[samples.dtype]
+    per_row = np.ndim(factor) > 0
+    output = np.empty(samples.shape, dtype=samples.dtype)
+    buf = np.empty((min(len(samples), _SCALE_BLOCK),) + samples.shape[1:])
+    for i in range(0, len(samples), _SCALE_BLOCK):
+        block = slice(i, i + _SCALE_BLOCK)
+        scaled = buf[:len(output[block])]
+        np.multiply(samples[block], factor[block] if per_row else factor, out=scaled)
+        np.floor(scaled, out=scaled)
+        np.clip(scaled, low, high, out=scaled)
+        output[block] = scaled
+    return output.tobytes()
+
+
+# samples overlay mixes at a time, so the widened copy of them stays small
+_OVERLAY_BLOCK = 1 << 16
+
+
+def _overlay_samples(output, offset, tile, times, sample_width, gain=None):
+    """
+    numpy version of overlay's mixing loop. Adds tile into the bytearray
+    output from the byte offset on, repeated times times (or until the end of
+    output when times is negative), saturating like audioop.add. When gain is
+    given, the overlaid part of output is scaled by it first (like audioop.mul).
+    """
+    dtype = _SAMPLE_DTYPES[sample_width]
+    low, high = _SAMPLE_LIMITS[dtype]
+
+    region = np.frombuffer(output, dtype=dtype)[offset // sample_width:]
+    tile = np.frombuffer(tile, dtype=dtype)
+    if times >= 0:
+        region = region[:len(tile) * times]
+
+    # repeat a short tile up to about a block, so the loop below steps a
+    # block at a time however short the tile is
+    if len(tile) < _OVERLAY_BLOCK:
+        tile = np.tile(tile, -(-_OVERLAY_BLOCK // len(tile)))
+    # wide enough for the sum of two samples (or a scaled sample)
+    wide = np.int64 if sample_width == 4 else np.int32
+    if gain is not None:
+        wide = np.float64
+
+    def mix(start, end):
+        end = min(end, len(region))
+        mixed = np.empty(min(end - start, _OVERLAY_BLOCK), dtype=wide)
+        i = start
+        while i < end:
+            # the tile starts part way through when i isn't tile aligned
+            phase = i % len(tile)
+            n = min(end - i, len(tile) - phase, _OVERLAY_BLOCK)
+            chunk = region[i:i + n]
+            block = mixed[:n]
+            if gain is None:
+                np.add(chunk, tile[phase:phase + n], out=block, dtype=wide)
+            else:
+                np.multiply(chunk, gain, out=block)
+                np.floor(block, out=block)
+                np.clip(block, low, high, out=block)
+                block += tile[phase:phase + n]
+            np.clip(block, low, high, out=block)
+            chunk[:] = block
+            i += n
+
+    # the chunks are disjoint parts of output, so they can be mixed on
+    # separate threads (numpy releases the GIL)
+    executor = _thread_pool(region.nbytes)
+    if executor is None:
+        mix(0, len(region))
+    else:
+        step = -(-len(region) // _cpu_count())
+        bounds = range(0, len(region), step)
+        for _ in executor.map(lambda start: mix(start, start + step), bounds):
+            pass
+
+
 class AudioSegment(object):
     """
     AudioSegments are *immutable* objects representing segments of audio
@@ -212,12 +448,12 @@ class AudioSegment(object):
             try:
                 data = data if isinstance(data, (basestring, bytes)) else data.read()
             except(OSError):
-                d = b''
+                chunks = []
                 reader = data.read(2 ** 31 - 1)
                 while reader:
-                    d += reader
+                    chunks.append(reader)
                     reader = data.read(2 ** 31 - 1)
-                data = d
+                data = b''.join(chunks)
 
             wav_data = read_wav_audio(data)
             if not wav_data:
@@ -235,28 +471,87 @@ class AudioSegment(object):
         # Convert 24-bit audio to 32-bit audio.
         # (stdlib audioop and array modules do not support 24-bit data)
         if self.sample_width == 3:
-            byte_buffer = BytesIO()
-
-            # Workaround for python 2 vs python 3. _data in 2.x are length-1 strings,
-            # And in 3.x are ints.
-            pack_fmt = 'BBB' if isinstance(self._data[0], int) else 'ccc'
-
-            # This conversion maintains the 24 bit values.  The values are
-            # not scaled up to the 32 bit range.  Other conversions could be
-            # implemented.
-            i = iter(self._data)
-            padding = {False: b'\x00', True: b'\xFF'}
-            for b0, b1, b2 in izip(i, i, i):
-                byte_buffer.write(padding[b2 > b'\x7f'[0]])
-                old_bytes = struct.pack(pack_fmt, b0, b1, b2)
-                byte_buffer.write(old_bytes)
-
-            self._data = byte_buffer.getvalue()
+            if np is not None:
+                # same byte layout as the loop below, built in one pass:
+                # the padding byte followed by the 3 original bytes
+                frames = np.frombuffer(self._data, dtype=np.uint8,
+                                       count=len(self._data) // 3 * 3)
+                frames = frames.reshape(-1, 3)
+                padded = np.empty((frames.shape[0], 4), dtype=np.uint8)
+                padded[:, 0] = np.where(frames[:, 2] > 0x7f, 0xFF, 0x00)
+                padded[:, 1:] = frames
+                self._data = padded.tobytes()
+            else:
+                frames = []
+
+                # Workaround for python 2 vs python 3. _data in 2.x are length-1 strings,
+                # And in 3.x are ints.
+                if isinstance(self._data[0], int):
+                    pack = _PACK_BBBB
+                    sign_pad = _SIGN_PAD.__getitem__
+                else:
+                    pack = _PACK_CCCC
+                    sign_pad = lambda b: _SIGN_PAD[ord(b)]
+
+                # This conversion maintains the 24 bit values.  The values are
+                # not scaled up to the 32 bit range.  Other conversions could be
+                # implemented.
+                i = iter(self._data)
+                for b0, b1, b2 in izip(i, i, i):
+                    frames.append(pack(sign_pad(b2), b0, b1, b2))
+
+                self._data = b''.join(frames)
             self.sample_width = 4
             self.frame_width = self.channels * self.sample_width
 
+        self._cache_lengths()
+
         super(AudioSegment, self).__init__(*args, **kwargs)
 
+    def _cache_lengths(self):
+        # the frame count and length only change with frame_rate and
+        # frame_width (whose setters call this again), so they're worked out
+        # up front rather than on every len() and slice
+        self._frames_per_ms = self._frame_rate / 1000.0
+        self._frame_count = float(len(self._data) // self._frame_width)
+        if self._frame_rate:
+            self._duration_seconds = self._frame_count / self._frame_rate
+            self._length_ms = round(1000 * self._duration_seconds)
+        else:
+            self._duration_seconds = 0.0
+            self._length_ms = 0
+
+    @property
+    def frame_rate(self):
+        return self._frame_rate
+
+    @frame_rate.setter
+    def frame_rate(self, frame_rate):
+        self._frame_rate = frame_rate
+        # only once __init__ has cached the lengths in the first place
+        if hasattr(self, '_length_ms'):
+            self._cache_lengths()
+
+    @property
+    def frame_width(self):
+        return self._frame_width
+
+    @frame_width.setter
+    def frame_width(self, frame_width):
+        self._frame_width = frame_width
+        if hasattr(self, '_length_ms'):
+            self._cache_lengths()
+
+    def __setstate__(self, state):
+        # segments pickled before frame_rate and frame_width were properties
+        # have them under their public names and none of the cached lengths
+        state = dict(state)
+        for name in ('frame_rate', 'frame_width'):
+            if name in state:
+                state['_' + name] = state.pop(name)
+        self.__dict__.update(state)
+        self._cache_lengths()
+
     @property
     def raw_data(self):
         """
@@ -272,6 +567,19 @@ class AudioSegment(object):
             array_type_override = self.array_type
         return array.array(array_type_override, self._data)
 
+    def get_samples_numpy(self):
+        """
+        returns the raw_data as a read-only numpy array that shares memory
+        with this segment (no copy is made). Multi-channel audio is shaped
+        (frames, channels) so that arr[:, 0] is the first channel.
+        """
+        if np is None:
+            raise ImportError("get_samples_numpy() requires numpy")
+        arr = np.frombuffer(self._data, dtype=_SAMPLE_DTYPES[self.sample_width])
+        if self.channels > 1:
+            arr = arr.reshape(-1, self.channels)
+        return arr
+
     @property
     def array_type(self):
         return get_array_type(self.sample_width * 8)
@@ -280,7 +588,7 @@ class AudioSegment(object):
         """
         returns the length of this audio segment in milliseconds
         """
-        return round(1000 * (self.frame_count() / self.frame_rate))
+        return self._length_ms
 
     def __eq__(self, other):
         try:
@@ -295,13 +603,27 @@ class AudioSegment(object):
         return not (self == other)
 
     def __iter__(self):
-        return (self[i] for i in xrange(len(self)))
+        # walk the raw data directly rather than through __getitem__, each
+        # millisecond starts where the previous one ended
+        data = self._data
+        frames_per_ms = self._frames_per_ms
+        frame_width = self.frame_width
+        start = 0
+        for i in xrange(len(self)):
+            end = int((i + 1) * frames_per_ms) * frame_width
+            if end > len(data):
+                # the last millisecond may need padding with silence
+                yield self._spawn_fast(self._slice_data(i, i + 1))
+            else:
+                yield self._spawn_fast(data[start:end])
+            start = end
 
     def __getitem__(self, millisecond):
         if isinstance(millisecond, slice):
             if millisecond.step:
+                step = millisecond.step
                 return (
-                    self[i:i + millisecond.step]
+                    self._spawn_fast(self._slice_data(i, min(i + step, len(self))))
                     for i in xrange(*millisecond.indices(len(self)))
                 )
 
@@ -315,6 +637,14 @@ class AudioSegment(object):
             start = millisecond
             end = millisecond + 1
 
+        return self._spawn_fast(self._slice_data(start, end))
+
+    def _slice_data(self, start, end):
+        """
+        Returns the raw data between two positions (in milliseconds), padded
+        with silence the same way as slicing the AudioSegment, without
+        building an intermediate AudioSegment.
+        """
         start = self._parse_position(start) * self.frame_width
         end = self._parse_position(end) * self.frame_width
         data = self._data[start:end]
@@ -323,16 +653,18 @@ class AudioSegment(object):
         expected_length = end - start
         missing_frames = (expected_length - len(data)) // self.frame_width
         if missing_frames:
-            if missing_frames > self.frame_count(ms=2):
+            if missing_frames > 2 * self._frames_per_ms:
                 raise TooManyMissingFrames(
                     "You should never be filling in "
                     "   more than 2 ms with silence here, "
                     "missing frames: %s" % missing_frames)
-            silence = audioop.mul(data[:self.frame_width],
-                                  self.sample_width, 0)
-            data += (silence * missing_frames)
+            # silence is all zero bytes for every supported sample width, so
+            # the padding can be allocated in one go (nothing is padded onto
+            # an empty slice, matching the old one-frame silence template)
+            silence_width = min(len(data), self.frame_width)
+            data += b'\0' * (silence_width * missing_frames)
 
-        return self._spawn(data)
+        return data
 
     def get_sample_slice(self, start_sample=None, end_sample=None):
         """
@@ -342,7 +674,7 @@ class AudioSegment(object):
         from the end of the audio segment like a python list.
         This is intentional.
         """
-        max_val = int(self.frame_count())
+        max_val = len(self._data) // self.frame_width
 
         def bounded(val, default):
             if val is None:
@@ -357,7 +689,7 @@ class AudioSegment(object):
         end_i = bounded(end_sample, max_val) * self.frame_width
 
         data = self._data[start_i:end_i]
-        return self._spawn(data)
+        return self._spawn_fast(data)
 
     def __add__(self, arg):
         if isinstance(arg, AudioSegment):
@@ -410,6 +742,11 @@ class AudioSegment(object):
         if isinstance(data, list):
             data = b''.join(data)
 
+        # accept buffers built up in place, the segment itself must hold
+        # immutable (and hashable) bytes
+        elif isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+
         if isinstance(data, array.array):
             try:
                 data = data.tobytes()
@@ -429,7 +766,37 @@ class AudioSegment(object):
             'channels': self.channels
         }
         metadata.update(overrides)
-        return self.__class__(data=data, metadata=metadata)
+
+        # 24-bit data still needs __init__ to widen it to 32-bit, and
+        # subclasses may set up attributes of their own in __init__
+        if metadata['sample_width'] == 3 or type(self) is not AudioSegment:
+            return self.__class__(data=data, metadata=metadata)
+
+        # otherwise the data is raw bytes by now, so there is nothing left
+        # for __init__ to do
+        seg = object.__new__(self.__class__)
+        seg._data = data
+        for attr, val in metadata.items():
+            setattr(seg, attr, val)
+        seg._cache_lengths()
+        return seg
+
+    def _spawn_fast(self, data):
+        """
+        Like _spawn, but only for raw data (bytes) in this segment's format,
+        which needs no conversion or validation.
+        """
+        if type(self) is not AudioSegment:
+            return self._spawn(data)
+
+        seg = object.__new__(self.__class__)
+        seg._data = data
+        seg.sample_width = self.sample_width
+        seg._frame_rate = self._frame_rate
+        seg.channels = self.channels
+        seg._frame_width = self._frame_width
+        seg._cache_lengths()
+        return seg
 
     @classmethod
     def _sync(cls, *segs):
@@ -444,10 +811,10 @@ class AudioSegment(object):
 
     def _parse_position(self, val):
         if val < 0:
-            val = len(self) - abs(val)
-        val = self.frame_count(ms=len(self)) if val == float("inf") else \
-            self.frame_count(ms=val)
-        return int(val)
+            val = self._length_ms - abs(val)
+        elif val == _INF:
+            val = self._length_ms
+        return int(val * self._frames_per_ms)
 
     @classmethod
     def empty(cls):
@@ -465,7 +832,9 @@ class AudioSegment(object):
         duration specified in milliseconds (default duration: 1000ms, default frame_rate: 11025).
         """
         frames = int(frame_rate * (duration / 1000.0))
-        data = b"\0\0" * frames
+        # repeating a single byte is a plain memset (bytes(n) would be too,
+        # but on python 2 it returns str(n))
+        data = b"\0" * (frames * 2)
         return cls(data, metadata={"channels": 1,
                                    "sample_width": 2,
                                    "frame_rate": frame_rate,
@@ -487,6 +856,22 @@ class AudioSegment(object):
         frame_rate = segs[0].frame_rate
 
         frame_count = max(int(seg.frame_count()) for seg in segs)
+
+        if np is not None and sample_width in _SAMPLE_DTYPES and \
+                all(len(seg._data) == frame_count * sample_width for seg in segs):
+            # interleave each channel with one strided assignment of whole
+            # samples
+            dtype = _SAMPLE_DTYPES[sample_width]
+            frames = np.empty((frame_count, channels), dtype=dtype)
+            for i, seg in enumerate(segs):
+                frames[:, i] = np.frombuffer(seg._data, dtype=dtype)
+            return cls(
+                frames.tobytes(),
+                channels=channels,
+                sample_width=sample_width,
+                frame_rate=frame_rate,
+            )
+
         data = array.array(
             segs[0].array_type,
             b'\0' * (frame_count * sample_width * channels)
@@ -864,7 +1249,7 @@ class AudioSegment(object):
                     'specify an ffmpeg raw format like format="s16le" instead '
                     'or call export(format="raw") with no codec or parameters')
 
-        out_f, _ = _fd_or_path_or_tempfile(out_f, 'wb+')
+        out_f, own_file = _fd_or_path_or_tempfile(out_f, 'wb+')
         out_f.seek(0)
 
         if format == "raw":
@@ -878,22 +1263,51 @@ class AudioSegment(object):
         if easy_wav:
             data = out_f
         else:
-            data = NamedTemporaryFile(mode="wb", delete=False)
+            # the wav data is piped into the converter's stdin
+            data = BytesIO()
 
         pcm_for_wav = self._data
         if self.sample_width == 1:
             # convert to unsigned integers for wav
             pcm_for_wav = audioop.bias(self._data, 1, 128)
-
-        wave_data = wave.open(data, 'wb')
-        wave_data.setnchannels(self.channels)
-        wave_data.setsampwidth(self.sample_width)
-        wave_data.setframerate(self.frame_rate)
-        # For some reason packing the wave header struct with
-        # a float in python 2 doesn't throw an exception
-        wave_data.setnframes(int(self.frame_count()))
-        wave_data.writeframesraw(pcm_for_wav)
-        wave_data.close()
+        elif sys.byteorder == 'big':
+            # wav data is always little-endian
+            samples = self.get_array_of_samples()
+            samples.byteswap()
+            try:
+                pcm_for_wav = samples.tobytes()
+            except:
+                pcm_for_wav = samples.tostring()
+
+        if self.channels and self.frame_rate:
+            # all of the data is known up front, so the header the wave module
+            # would produce can be packed in one go and the data written as is
+            header = _WAV_HEADER.pack(
+                b'RIFF', 36 + len(pcm_for_wav), b'WAVE',
+                b'fmt ', 16, 1,  # WAVE_FORMAT_PCM
+                self.channels, self.frame_rate,
+                self.channels * self.frame_rate * self.sample_width,
+                self.frame_width, self.sample_width * 8,
+                b'data', len(pcm_for_wav))
+            if easy_wav and own_file:
+                # a plain file we opened ourselves, so it's safe to write to
+                # its file descriptor directly
+                _write_chunks(data, [header, pcm_for_wav])
+            else:
+                data.write(header)
+                data.write(pcm_for_wav)
+            data.flush()
+        else:
+            # let the wave module report the missing parameters
+            wave_data = wave.open(data, 'wb')
+            wave_data.setnchannels(self.channels)
+            wave_data.setsampwidth(self.sample_width)
+            wave_data.setframerate(self.frame_rate)
+            # For some reason packing the wave header struct with
+            # a float in python 2 doesn't throw an exception
+            wave_data.setnframes(int(self.frame_count()))
+            wave_data.writeframesraw(pcm_for_wav)
+            wave_data.close()
 
         # for easy wav files, we're done (wav data is written directly to out_f)
         if easy_wav:
@@ -906,7 +1320,7 @@ class AudioSegment(object):
         conversion_command = [
             self.converter,
             '-y',  # always overwrite existing files
-            "-f", "wav", "-i", data.name,  # input options (filename last)
+            "-f", "wav", "-i", "-",  # input options (filename last)
         ]
 
         if codec is None:
@@ -958,10 +1372,11 @@ class AudioSegment(object):
 
         log_conversion(conversion_command)
 
-        # read stdin / write stdout
-        with open(os.devnull, 'rb') as devnull:
-            p = subprocess.Popen(conversion_command, stdin=devnull, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        p_out, p_err = p.communicate()
+        # write stdin / read stdout
+        p = subprocess.Popen(conversion_command, stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        p_out, p_err = p.communicate(input=data.getvalue())
+        data.close()
 
         log_subprocess_output(p_out)
         log_subprocess_output(p_err)
@@ -976,18 +1391,16 @@ class AudioSegment(object):
             out_f.write(output.read())
 
         finally:
-            data.close()
             output.close()
-            os.unlink(data.name)
             os.unlink(output.name)
 
         out_f.seek(0)
         return out_f
 
     def get_frame(self, index):
-        frame_start = index * self.frame_width
-        frame_end = frame_start + self.frame_width
-        return self._data[frame_start:frame_end]
+        frame_width = self.frame_width
+        frame_start = index * frame_width
+        return self._data[frame_start:frame_start + frame_width]
 
     def frame_count(self, ms=None):
         """
@@ -995,9 +1408,9 @@ class AudioSegment(object):
             if not specified, the number of frames in the whole AudioSegment
         """
         if ms is not None:
-            return ms * (self.frame_rate / 1000.0)
+            return ms * self._frames_per_ms
         else:
-            return float(len(self._data) // self.frame_width)
+            return self._frame_count
 
     def set_sample_width(self, sample_width):
         if sample_width == self.sample_width:
@@ -1005,8 +1418,31 @@ class AudioSegment(object):
 
         frame_width = self.channels * sample_width
 
+        # a single C lin2lin call beats numpy on one thread, so the shift is
+        # only used when audioop is pure python or the work can be split up
+        if np is not None and self.sample_width != 3 and sample_width != 3 and \
+                (_PURE_AUDIOOP or _thread_pool(len(self._data)) is not None):
+            # same result as audioop.lin2lin (keep the high bytes of each
+            # sample) in a single vectorized shift
+            from_dtype = _SAMPLE_DTYPES[self.sample_width]
+            dtype = _SAMPLE_DTYPES[sample_width]
+            shift = 8 * abs(sample_width - self.sample_width)
+            widen = sample_width > self.sample_width
+
+            def convert(chunk):
+                samples = np.frombuffer(chunk, dtype=from_dtype)
+                if widen:
+                    samples = samples.astype(dtype) << shift
+                else:
+                    samples = (samples >> shift).astype(dtype)
+                return samples.tobytes()
+
+            data = _in_parallel(convert, self._data, self.sample_width)
+        else:
+            data = audioop.lin2lin(self._data, self.sample_width, sample_width)
+
         return self._spawn(
-            audioop.lin2lin(self._data, self.sample_width, sample_width),
+            data,
             overrides={'sample_width': sample_width, 'frame_width': frame_width}
         )
 
@@ -1065,6 +1501,18 @@ class AudioSegment(object):
         if self.channels == 1:
             return [self]
 
+        if np is not None and self.sample_width in _SAMPLE_DTYPES and \
+                len(self._data) % self.frame_width == 0:
+            # view the frames as (frame, channel) samples so each channel is
+            # copied out in a single strided pass
+            frames = np.frombuffer(self._data, dtype=_SAMPLE_DTYPES[self.sample_width]).reshape(
+                -1, self.channels)
+            return [
+                self._spawn(frames[:, i].tobytes(),
+                            overrides={"channels": 1, "frame_width": self.sample_width})
+                for i in range(self.channels)
+            ]
+
         samples = self.get_array_of_samples()
 
         mono_channels = []
@@ -1111,7 +1559,7 @@ class AudioSegment(object):
 
     @property
     def duration_seconds(self):
-        return self.frame_rate and self.frame_count() / self.frame_rate or 0.0
+        return self._duration_seconds
 
     def get_dc_offset(self, channel=1):
         """
@@ -1169,8 +1617,12 @@ class AudioSegment(object):
                                             self.sample_width))
 
     def apply_gain(self, volume_change):
-        return self._spawn(data=audioop.mul(self._data, self.sample_width,
-                                            db_to_float(float(volume_change))))
+        if volume_change == 0:
+            # AudioSegments are immutable, no need for a copy
+            return self
+
+        return self._spawn_fast(_mul(self._data, self.sample_width,
+                                     db_to_float(float(volume_change))))
 
     def overlay(self, seg, position=0, loop=False, times=None, gain_during_overlay=None):
         """
@@ -1208,17 +1660,42 @@ class AudioSegment(object):
             # it's a no-op, make a copy since we never mutate
             return self._spawn(self._data)
 
-        output = StringIO()
-
         seg1, seg2 = AudioSegment._sync(self, seg)
         sample_width = seg1.sample_width
         spawn = seg1._spawn
 
-        output.write(seg1[:position]._data)
+        # the output is the same size as seg1, so allocate it once and
+        # overwrite the overlaid regions in place
+        position = min(position, len(seg1))
+        offset = seg1._parse_position(position) * seg1.frame_width
+        if 0 <= offset and seg1._parse_position(len(seg1)) * seg1.frame_width == len(seg1._data):
+            # the parts before and after position are just the raw data
+            output = bytearray(seg1._data)
+        else:
+            before = seg1._slice_data(0, position)
+            after = seg1._slice_data(position, len(seg1))
+            offset = len(before)
+            output = bytearray(offset + len(after))
+            output[:offset] = before
+            output[offset:] = after
+
+        # drop down to the raw data, each region of seg1 that gets overlaid
+        # is read back from the output just before it is overwritten
+        seg1 = _data_view(output)[offset:]
+        seg2 = _data_view(seg2._data)
+
+        gain = None
+        if gain_during_overlay:
+            gain = db_to_float(float(gain_during_overlay))
+
+        # mix every repetition of seg2 in one go when numpy is available
+        # (audioop.mul below works on self's sample width, even when the sync
+        # changed seg1's, so that case stays on the loop)
+        if np is not None and len(seg2) and (times < 0 or isinstance(times, int)) \
+                and not (gain_during_overlay and self.sample_width != sample_width):
+            _overlay_samples(output, offset, seg2, times, sample_width, gain)
+            times = 0
 
-        # drop down to the raw data
-        seg1 = seg1[position:]._data
-        seg2 = seg2._data
         pos = 0
         seg1_len = len(seg1)
         seg2_len = len(seg2)
@@ -1233,19 +1710,17 @@ class AudioSegment(object):
 
             if gain_during_overlay:
                 seg1_overlaid = seg1[pos:pos + seg2_len]
-                seg1_adjusted_gain = audioop.mul(seg1_overlaid, self.sample_width,
-                                                 db_to_float(float(gain_during_overlay)))
-                output.write(audioop.add(seg1_adjusted_gain, seg2, sample_width))
+                seg1_adjusted_gain = audioop.mul(seg1_overlaid, self.sample_width, gain)
+                mixed = audioop.add(seg1_adjusted_gain, seg2, sample_width)
             else:
-                output.write(audioop.add(seg1[pos:pos + seg2_len], seg2,
-                                         sample_width))
+                mixed = audioop.add(seg1[pos:pos + seg2_len], seg2,
+                                    sample_width)
+            output[offset + pos:offset + pos + seg2_len] = mixed
             pos += seg2_len
 
             # dec times to break our while loop (eventually)
             times -= 1
 
-        output.write(seg1[pos:])
-
         return spawn(data=output)
 
     def append(self, seg, crossfade=100):
@@ -1253,7 +1728,17 @@ class AudioSegment(object):
 
         if not crossfade:
             return seg1._spawn(seg1._data + seg2._data)
-        elif crossfade > len(self):
+
+        keep, tail = seg1._crossfade_into(seg2, crossfade)
+        return seg1._spawn(data=[seg1._data[:keep]] + tail)
+
+    def _crossfade_into(self, seg, crossfade):
+        """
+        The crossfade half of append(), for segments that are already in the
+        same format. Returns how many bytes of self's data come before the
+        crossfade, and the list of raw data pieces that follow them.
+        """
+        if crossfade > len(self):
             raise ValueError("Crossfade is longer than the original AudioSegment ({}ms > {}ms)".format(
                 crossfade, len(self)
             ))
@@ -1262,19 +1747,20 @@ class AudioSegment(object):
                 crossfade, len(seg)
             ))
 
-        xf = seg1[-crossfade:].fade(to_gain=-120, start=0, end=float('inf'))
-        xf *= seg2[:crossfade].fade(from_gain=-120, start=0, end=float('inf'))
+        xf = self[-crossfade:].fade(to_gain=-120, start=0, end=_INF)
+        xf *= seg[:crossfade].fade(from_gain=-120, start=0, end=_INF)
 
-        output = BytesIO()
+        tail = [xf._data, seg._slice_data(min(crossfade, len(seg)), len(seg))]
 
-        output.write(seg1[:-crossfade]._data)
-        output.write(xf._data)
-        output.write(seg2[crossfade:]._data)
+        keep = self._parse_position(-crossfade) * self.frame_width
+        if keep > len(self._data):
+            # the part before the crossfade runs past the end of the data
+            # (only possible for crossfades under half a millisecond), so it
+            # is padded with silence like any other slice
+            tail.insert(0, self._slice_data(0, -crossfade)[len(self._data):])
+            keep = len(self._data)
 
-        output.seek(0)
-        obj = seg1._spawn(data=output)
-        output.close()
-        return obj
+        return keep, tail
 
     def fade(self, to_gain=0, from_gain=0, start=None, end=None,
              duration=None):
@@ -1327,15 +1813,25 @@ class AudioSegment(object):
 
         output = []
 
+        # the faded portion is built up in a single buffer rather than as one
+        # bytes object per millisecond (or per frame)
+        faded = bytearray()
+
         # original data - up until the crossfade portion, as is
-        before_fade = self[:start]._data
+        before_fade = self._slice_data(0, start)
         if from_gain != 0:
-            before_fade = audioop.mul(before_fade,
-                                      self.sample_width,
-                                      from_power)
+            before_fade = _mul(before_fade, self.sample_width, from_power)
         output.append(before_fade)
 
-        gain_delta = db_to_float(to_gain) - from_power
+        to_power = db_to_float(to_gain)
+        gain_delta = to_power - from_power
+
+        # the loops below run once per millisecond or frame, so keep the
+        # lookups they do in locals
+        mul = audioop.mul
+        slice_data = self._slice_data
+        sample_width = self.sample_width
+        frame_width = self.frame_width
 
         # fades longer than 100ms can use coarse fading (one gain step per ms),
         # shorter fades will have audible clicks so they use precise fading
@@ -1343,39 +1839,82 @@ class AudioSegment(object):
         if duration > 100:
             scale_step = gain_delta / duration
 
-            for i in range(duration):
-                volume_change = from_power + (scale_step * i)
-                chunk = self[start + i]
-                chunk = audioop.mul(chunk._data,
-                                    self.sample_width,
-                                    volume_change)
+            # when none of the fade wraps around or runs past the end of the
+            # data, every millisecond simply starts where the previous one ended
+            contiguous = start >= 0 and \
+                self._parse_position(start + duration) * frame_width <= len(self._data)
+
+            if np is not None and contiguous:
+                # every frame gets the gain of the millisecond it falls in
+                bounds = ((start + np.arange(duration + 1)) *
+                          self._frames_per_ms).astype(np.int64)
+                gains = from_power + scale_step * np.arange(duration)
+                gains = np.repeat(gains, np.diff(bounds))
+                samples = np.frombuffer(self._data,
+                                        dtype=_SAMPLE_DTYPES[self.sample_width],
+                                        count=len(gains) * self.channels,
+                                        offset=bounds[0] * frame_width)
+                samples = samples.reshape(-1, self.channels)
+                faded = _scale_samples(samples, gains[:, np.newaxis])
+
+            # without numpy, each millisecond still gets its own audioop.mul
+            elif contiguous:
+                data = _data_view(self._data)
+                frames_per_ms = self._frames_per_ms
+                chunk_start = self._parse_position(start) * frame_width
+                for i in range(duration):
+                    volume_change = from_power + (scale_step * i)
+                    chunk_end = int((start + i + 1) * frames_per_ms) * frame_width
+                    chunk = data[chunk_start:chunk_end]
+                    chunk_start = chunk_end
+
+                    faded += mul(chunk, sample_width, volume_change)
+
+            # work on the raw data directly, self[start + i] would build an
+            # AudioSegment for every millisecond of the fade
+            else:
+                for i in range(duration):
+                    volume_change = from_power + (scale_step * i)
+                    chunk = slice_data(start + i, start + i + 1)
 
-                output.append(chunk)
+                    faded += mul(chunk, sample_width, volume_change)
         else:
             start_frame = self.frame_count(ms=start)
             end_frame = self.frame_count(ms=end)
             fade_frames = end_frame - start_frame
             scale_step = gain_delta / fade_frames
 
-            for i in range(int(fade_frames)):
-                volume_change = from_power + (scale_step * i)
-                sample = self.get_frame(int(start_frame + i))
-                sample = audioop.mul(sample, self.sample_width, volume_change)
+            if np is not None and start_frame >= 0:
+                # one gain per frame, frames past the end of the data are
+                # skipped just like the loop below skips them
+                steps = np.arange(max(int(fade_frames), 0))
+                frames = (start_frame + steps).astype(np.int64)
+                steps = steps[frames < self._frame_count]
+                samples = np.frombuffer(self._data,
+                                        dtype=_SAMPLE_DTYPES[self.sample_width])
+                samples = samples.reshape(-1, self.channels)[frames[:len(steps)]]
+                gains = from_power + scale_step * steps
+                faded = _scale_samples(samples, gains[:, np.newaxis])
+            else:
+                data = _data_view(self._data)
+                for i in range(int(fade_frames)):
+                    volume_change = from_power + (scale_step * i)
+                    frame_start = int(start_frame + i) * frame_width
+                    sample = data[frame_start:frame_start + frame_width]
+                    faded += mul(sample, sample_width, volume_change)
 
-                output.append(sample)
+        output.append(faded)
 
         # original data after the crossfade portion, at the new volume
-        after_fade = self[end:]._data
+        after_fade = self._slice_data(min(end, len(self)), len(self))
         if to_gain != 0:
-            after_fade = audioop.mul(after_fade,
-                                     self.sample_width,
-                                     db_to_float(to_gain))
+            after_fade = _mul(after_fade, self.sample_width, to_power)
         output.append(after_fade)
 
         return self._spawn(data=output)
 
     def fade_out(self, duration):
-        return self.fade(to_gain=-120, duration=duration, end=float('inf'))
+        return self.fade(to_gain=-120, duration=duration, end=_INF)
 
     def fade_in(self, duration):
         return self.fade(from_gain=-120, duration=duration, start=0)
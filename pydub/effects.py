@@ -9,13 +9,42 @@ from .utils import (
     audioop,
     get_min_max_value
 )
-from .silence import split_on_silence
+from .silence import split_on_silence, _rms_between
+from .audio_segment import _data_view, _scale_samples
 from .exceptions import TooManyMissingFrames, InvalidDuration
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 if sys.version_info >= (3, 0):
     xrange = range
 
 
+def _append_all(segs, crossfades):
+    """
+    Same as appending each of segs to the first in turn, crossfading by the
+    matching entry of crossfades each time, but the result is built up in one
+    buffer rather than being copied in full by every append.
+    """
+    out = segs[0]
+    data = bytearray(out._data)
+    for seg, crossfade in zip(segs[1:], crossfades):
+        if not crossfade:
+            data += seg._data
+            continue
+
+        # a segment around the buffer so far (no copy is made), only the
+        # part of it that gets crossfaded is read
+        keep, tail = out._spawn_fast(data)._crossfade_into(seg, crossfade)
+        del data[keep:]
+        for piece in tail:
+            data += piece
+
+    return out._spawn(data)
+
+
 @register_pydub_effect
 def apply_mono_filter_to_each_channel(seg, filter_fn):
     n_channels = seg.channels
@@ -36,6 +65,8 @@ def apply_mono_filter_to_each_channel(seg, filter_fn):
 def normalize(seg, headroom=0.1):
     """
     headroom is how close to the maximum volume to boost the signal up to (specified in dB)
+
+    audio whose peak is already within 0.01 dB of that is returned as is
     """
     peak_sample_val = seg.max
     
@@ -46,6 +77,11 @@ def normalize(seg, headroom=0.1):
     target_peak = seg.max_possible_amplitude * db_to_float(-headroom)
 
     needed_boost = ratio_to_db(target_peak / peak_sample_val)
+
+    # already normalized, a gain this small isn't worth a pass over the data
+    if abs(needed_boost) < 0.01:
+        return seg
+
     return seg.apply_gain(needed_boost)
 
 
@@ -86,12 +122,8 @@ def speedup(seg, playback_speed=1.5, chunk_size=150, crossfade=25):
     last_chunk = chunks[-1]
     chunks = [chunk[:-ms_to_remove_per_chunk] for chunk in chunks[:-1]]
 
-    out = chunks[0]
-    for chunk in chunks[1:]:
-        out = out.append(chunk, crossfade=crossfade)
-
-    out += last_chunk
-    return out
+    return _append_all(chunks + [last_chunk],
+                       [crossfade] * (len(chunks) - 1) + [0])
     
 
 @register_pydub_effect
@@ -105,11 +137,39 @@ def strip_silence(seg, silence_len=1000, silence_thresh=-16, padding=100):
     if not len(chunks):
         return seg[0:0]
 
-    seg = chunks[0]
-    for chunk in chunks[1:]:
-        seg = seg.append(chunk, crossfade=crossfade)
+    return _append_all(chunks, [crossfade] * (len(chunks) - 1))
 
-    return seg
+
+def _attenuation_gains(over_threshold, max_attenuations, attenuation_incs, attenuation_decs):
+    """
+    compress_dynamic_range's attack/release, run over per-frame lists of its
+    inputs. Returns the gain for every frame. Each frame's attenuation
+    depends on the previous one, so this can't be vectorized and is kept to
+    plain float operations (min()/max() spelled out, the gain only worked
+    out when the attenuation changes).
+    """
+    attenuation = 0.0
+    gain, gain_attenuation = 1.0, 0.0
+    gains = []
+    append = gains.append
+    for loud, max_attenuation, attenuation_inc, attenuation_dec in zip(
+            over_threshold, max_attenuations, attenuation_incs, attenuation_decs):
+        if loud and attenuation <= max_attenuation:
+            attenuation += attenuation_inc
+            if max_attenuation < attenuation:
+                attenuation = max_attenuation
+        else:
+            attenuation -= attenuation_dec
+            if 0 > attenuation:
+                attenuation = 0
+
+        # the attenuation often holds steady (at 0 or at its target), so
+        # the gain only needs working out when it changes
+        if attenuation != gain_attenuation:
+            gain, gain_attenuation = 10 ** (-attenuation / 20.0), attenuation
+        append(gain)
+
+    return gains
 
 
 @register_pydub_effect
@@ -145,8 +205,16 @@ def compress_dynamic_range(seg, threshold=-20.0, ratio=4.0, attack=5.0, release=
     thresh_rms = seg.max_possible_amplitude * db_to_float(threshold)
     
     look_frames = int(seg.frame_count(ms=attack))
+    data = _data_view(seg._data)
+    frame_width = seg.frame_width
+    frame_count = len(seg._data) // frame_width
+    sample_width = seg.sample_width
     def rms_at(frame_i):
-        return seg.get_sample_slice(frame_i - look_frames, frame_i).rms
+        # same bounds as seg.get_sample_slice(frame_i - look_frames, frame_i),
+        # without building an AudioSegment for every frame
+        start = min(max(frame_i - look_frames, 0), frame_count)
+        return audioop.rms(data[start * frame_width:frame_i * frame_width],
+                           sample_width)
     def db_over_threshold(rms):
         if rms == 0: return 0.0
         db = ratio_to_db(rms / thresh_rms)
@@ -159,6 +227,39 @@ def compress_dynamic_range(seg, threshold=-20.0, ratio=4.0, attack=5.0, release=
     
     attack_frames = seg.frame_count(ms=attack)
     release_frames = seg.frame_count(ms=release)
+
+    # with numpy, the rms of every frame's look-back window comes from one
+    # running sum and all the frames are scaled in one go at the end, only the
+    # attenuation itself is still worked out frame by frame
+    envelope = None
+    if np is not None:
+        frames = np.arange(int(seg.frame_count()))
+        look_starts = np.clip(frames - look_frames, 0, frames)
+        envelope = _rms_between(seg, look_starts, frames,
+                                (frames - look_starts) * seg.channels)
+
+    if envelope is not None:
+        # the attenuation targets only depend on the rms, so they're worked
+        # out once for each distinct rms and then looked up for every frame
+        levels, level_of_frame = np.unique(envelope, return_inverse=True)
+        targets = []
+        for rms_now in levels.tolist():
+            max_attenuation = (1 - (1.0 / ratio)) * db_over_threshold(rms_now)
+            targets.append((max_attenuation,
+                            max_attenuation / attack_frames,
+                            max_attenuation / release_frames))
+        targets = np.array(targets, dtype=np.float64).reshape(-1, 3)[level_of_frame]
+        gains = _attenuation_gains((envelope > thresh_rms).tolist(),
+                                   *targets.T.tolist())
+
+        samples = np.frombuffer(seg._data, dtype=seg.array_type,
+                                count=len(gains) * seg.channels)
+        gains = np.array(gains, dtype=np.float64)[:, np.newaxis]
+        return seg._spawn(data=_scale_samples(samples.reshape(-1, seg.channels), gains))
+
+    gain, gain_attenuation = 1.0, 0.0
+    get_frame = seg.get_frame
+    mul = audioop.mul
     for i in xrange(int(seg.frame_count())):
         rms_now = rms_at(i)
         
@@ -176,11 +277,11 @@ def compress_dynamic_range(seg, threshold=-20.0, ratio=4.0, attack=5.0, release=
             attenuation -= attenuation_dec
             attenuation = max(attenuation, 0)
         
-        frame = seg.get_frame(i)
+        frame = get_frame(i)
         if attenuation != 0.0:
-            frame = audioop.mul(frame,
-                                seg.sample_width,
-                                db_to_float(-attenuation))
+            if attenuation != gain_attenuation:
+                gain, gain_attenuation = db_to_float(-attenuation), attenuation
+            frame = mul(frame, sample_width, gain)
         
         output.append(frame)
     
@@ -11,6 +11,12 @@ import math
 import array
 import itertools
 import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from .audio_segment import AudioSegment
 from .utils import (
     db_to_float,
@@ -40,15 +46,26 @@ class SignalGenerator(object):
         gain = db_to_float(volume)
         sample_count = int(self.sample_rate * (duration / 1000.0))
 
-        sample_data = (int(val * maxval * gain) for val in self.generate())
-        sample_data = itertools.islice(sample_data, 0, sample_count)
+        samples = None
+        if np is not None and sample_count >= 0:
+            samples = np.trunc(self._generate_samples(sample_count) * maxval * gain)
+            # samples that don't fit the sample type (or aren't numbers) are
+            # left to array.array to complain about
+            if len(samples) and not (minval <= samples.min() and samples.max() <= maxval):
+                samples = None
+
+        if samples is not None:
+            data = samples.astype(array_type).tobytes()
+        else:
+            sample_data = (int(val * maxval * gain) for val in self.generate())
+            sample_data = itertools.islice(sample_data, 0, sample_count)
 
-        data = array.array(array_type, sample_data)
-        
-        try:
-            data = data.tobytes()
-        except:
-            data = data.tostring()
+            data = array.array(array_type, sample_data)
+
+            try:
+                data = data.tobytes()
+            except:
+                data = data.tostring()
 
         return AudioSegment(data=data, metadata={
             "channels": 1,
@@ -60,6 +77,14 @@ class SignalGenerator(object):
     def generate(self):
         raise NotImplementedError("SignalGenerator subclasses must implement the generate() method, and *should not* call the superclass implementation.")
 
+    def _generate_samples(self, sample_count):
+        """
+        The first sample_count values of generate() as a numpy array.
+        Subclasses that can compute them all at once override this.
+        """
+        return np.fromiter(itertools.islice(self.generate(), sample_count),
+                           dtype=np.float64)
+
 
 
 class Sine(SignalGenerator):
@@ -74,6 +99,14 @@ class Sine(SignalGenerator):
             yield math.sin(sine_of * sample_n)
             sample_n += 1
 
+    def _generate_samples(self, sample_count):
+        # subclasses with their own generate() have to go through it
+        if type(self).generate != Sine.generate:
+            return super(Sine, self)._generate_samples(sample_count)
+
+        sine_of = (self.freq * 2 * math.pi) / self.sample_rate
+        return np.sin(sine_of * np.arange(sample_count))
+
 
 
 class Pulse(SignalGenerator):
@@ -96,6 +129,17 @@ class Pulse(SignalGenerator):
                 yield -1.0
             sample_n += 1
 
+    def _generate_samples(self, sample_count):
+        # subclasses with their own generate() have to go through it
+        if type(self).generate != Pulse.generate:
+            return super(Pulse, self)._generate_samples(sample_count)
+
+        cycle_length = self.sample_rate / float(self.freq)
+        pulse_length = cycle_length * self.duty_cycle
+
+        cycle_position = np.arange(sample_count) % cycle_length
+        return np.where(cycle_position < pulse_length, 1.0, -1.0)
+
 
 
 class Square(Pulse):
@@ -128,6 +172,24 @@ class Sawtooth(SignalGenerator):
                 yield 1.0 - (2 * (cycle_position - midpoint) / descend_length)
             sample_n += 1
 
+    def _generate_samples(self, sample_count):
+        # subclasses with their own generate() have to go through it
+        if type(self).generate != Sawtooth.generate:
+            return super(Sawtooth, self)._generate_samples(sample_count)
+
+        cycle_length = self.sample_rate / float(self.freq)
+        midpoint = cycle_length * self.duty_cycle
+        ascend_length = midpoint
+        descend_length = cycle_length - ascend_length
+
+        cycle_position = np.arange(sample_count) % cycle_length
+        # both slopes are worked out for every sample, the one that isn't
+        # picked may divide by a zero length
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(cycle_position < midpoint,
+                            (2 * cycle_position / ascend_length) - 1.0,
+                            1.0 - (2 * (cycle_position - midpoint) / descend_length))
+
 
 
 class Triangle(Sawtooth):
@@ -5,21 +5,51 @@ is tricky to install. See my notes on installing pyaudio in a virtualenv (on
 OSX 10.10): https://gist.github.com/jiaaro/9767512210a1d80a8a0d
 """
 
+import atexit
 import subprocess
-from tempfile import NamedTemporaryFile
-from .utils import get_player_name, make_chunks
+from io import BytesIO
+from .utils import get_player_name
+
+# PortAudio is slow to start up, so one PyAudio instance is kept around
+# between calls to play() (each call still opens and drains its own stream)
+_pyaudio = None
 
 def _play_with_ffplay(seg):
     PLAYER = get_player_name()
-    with NamedTemporaryFile("w+b", suffix=".wav") as f:
-        seg.export(f.name, "wav")
-        subprocess.call([PLAYER, "-nodisp", "-autoexit", "-hide_banner", f.name])
+    # the wav data is piped into the player's stdin rather than written to a
+    # temporary file first
+    wav_data = seg.export(BytesIO(), "wav").getvalue()
+    player = subprocess.Popen([PLAYER, "-nodisp", "-autoexit", "-hide_banner",
+                               "-f", "wav", "-i", "-"],
+                              stdin=subprocess.PIPE)
+    try:
+        player.communicate(input=wav_data)
+    except:
+        player.kill()
+        player.wait()
+        raise
 
 
-def _play_with_pyaudio(seg):
+def _get_pyaudio():
+    global _pyaudio
     import pyaudio
 
-    p = pyaudio.PyAudio()
+    if _pyaudio is None:
+        _pyaudio = pyaudio.PyAudio()
+        atexit.register(_close_pyaudio)
+    return _pyaudio
+
+
+def _close_pyaudio():
+    global _pyaudio
+
+    if _pyaudio is not None:
+        _pyaudio.terminate()
+        _pyaudio = None
+
+
+def _play_with_pyaudio(seg):
+    p = _get_pyaudio()
     stream = p.open(format=p.get_format_from_width(seg.sample_width),
                     channels=seg.channels,
                     rate=seg.frame_rate,
@@ -29,14 +59,15 @@ def _play_with_pyaudio(seg):
     # So as not to raise OSError: Device Unavailable should play() be used again
     try:
         # break audio into half-second chunks (to allows keyboard interrupts)
-        for chunk in make_chunks(seg, 500):
-            stream.write(chunk._data)
+        chunk_size = max(int(seg.frame_rate * 0.5), 1) * seg.frame_width
+        data = seg._data
+        for i in range(0, len(data), chunk_size):
+            stream.write(data[i:i + chunk_size])
     finally:
+        # stop_stream() waits for the queued audio to finish playing
         stream.stop_stream()
         stream.close()
 
-        p.terminate()
-
 
 def _play_with_simpleaudio(seg):
     import simpleaudio
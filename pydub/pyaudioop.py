@@ -4,6 +4,7 @@ try:
 except ImportError:
     from builtins import max as builtin_max
     from builtins import min as builtin_min
+import array
 import math
 import struct
 try:
@@ -11,6 +12,10 @@ try:
 except ImportError:  # Python 3.9+
     from math import gcd
 from ctypes import create_string_buffer
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class error(Exception):
@@ -29,12 +34,11 @@ def _check_params(length, size):
 
 
 def _sample_count(cp, size):
-    return len(cp) / size
+    return len(cp) // size
 
 
 def _get_samples(cp, size, signed=True):
-    for i in range(_sample_count(cp, size)):
-        yield _get_sample(cp, size, i, signed)
+    return iter(_get_array(cp, size, signed))
 
 
 def _struct_format(size, signed):
@@ -46,42 +50,82 @@ def _struct_format(size, signed):
         return "i" if signed else "I"
 
 
+_structs = dict(((size, signed), struct.Struct(_struct_format(size, signed)))
+                for size in (1, 2, 4) for signed in (True, False))
+
+
 def _get_sample(cp, size, i, signed=True):
-    fmt = _struct_format(size, signed)
-    start = i * size
-    end = start + size
-    return struct.unpack_from(fmt, buffer(cp)[start:end])[0]
+    return _structs[size, signed].unpack_from(cp, i * size)[0]
+
+
+def _get_array(cp, size, signed=True):
+    samples = array.array(_struct_format(size, signed))
+    try:
+        samples.frombytes(cp)
+    except AttributeError:  # python 2
+        samples.fromstring(cp)
+    return samples
+
+
+def _array_to_bytes(samples):
+    try:
+        return samples.tobytes()
+    except AttributeError:  # python 2
+        return samples.tostring()
+
+
+def _np_samples(cp, size):
+    return np.frombuffer(cp, dtype=_np_formats[size][0])
+
+
+def _np_running_sum(values):
+    # element i is the sum of the first i values, written straight into one
+    # array rather than prepending a zero to the cumsum afterwards
+    sums = np.empty(len(values) + 1, dtype=np.int64)
+    sums[0] = 0
+    np.cumsum(values, out=sums[1:])
+    return sums
+
+
+def _np_clip_to_bytes(samples, size):
+    # floor then saturate, the way audioop rounds a scaled sample. samples
+    # is always a temporary, so both happen in place
+    dtype, low, high = _np_formats[size]
+    np.floor(samples, out=samples)
+    np.clip(samples, low, high, out=samples)
+    return samples.astype(dtype).tobytes()
 
 
 def _put_sample(cp, size, i, val, signed=True):
-    fmt = _struct_format(size, signed)
-    struct.pack_into(fmt, cp, i * size, val)
+    _structs[size, signed].pack_into(cp, i * size, val)
+
+
+_maxvals = {
+    (1, True): 0x7f, (1, False): 0xff,
+    (2, True): 0x7fff, (2, False): 0xffff,
+    (4, True): 0x7fffffff, (4, False): 0xffffffff,
+}
+_minvals = {
+    (1, True): -0x80, (1, False): 0,
+    (2, True): -0x8000, (2, False): 0,
+    (4, True): -0x80000000, (4, False): 0,
+}
+
+
+if np is not None:
+    # numpy dtype and clipping limits for each (signed) sample size
+    _np_formats = dict(
+        (size, (np.dtype(_struct_format(size, True)),
+                _minvals[size, True], _maxvals[size, True]))
+        for size in (1, 2, 4))
 
 
 def _get_maxval(size, signed=True):
-    if signed and size == 1:
-        return 0x7f
-    elif size == 1:
-        return 0xff
-    elif signed and size == 2:
-        return 0x7fff
-    elif size == 2:
-        return 0xffff
-    elif signed and size == 4:
-        return 0x7fffffff
-    elif size == 4:
-        return 0xffffffff
+    return _maxvals.get((size, signed))
 
 
 def _get_minval(size, signed=True):
-    if not signed:
-        return 0
-    elif size == 1:
-        return -0x80
-    elif size == 2:
-        return -0x8000
-    elif size == 4:
-        return -0x80000000
+    return _minvals.get((size, signed))
 
 
 def _get_clipfn(size, signed=True):
@@ -104,6 +148,17 @@ def _overflow(val, size, signed=True):
         return val % (2**bits)
 
 
+def _wrapped_bytes(samples, size):
+    """
+    Packs samples as size byte integers, wrapping out of range values
+    around like _overflow does, but with a mask rather than a modulo
+    """
+    mask = (1 << (8 * size)) - 1
+    wrapped = array.array(_struct_format(size, False),
+                          [sample & mask for sample in samples])
+    return _array_to_bytes(wrapped)
+
+
 def getsample(cp, size, i):
     _check_params(len(cp), size)
     if not (0 <= i < len(cp) / size):
@@ -117,13 +172,24 @@ def max(cp, size):
     if len(cp) == 0:
         return 0
 
+    if np is not None:
+        samples = _np_samples(cp, size).astype(np.int64)
+        return int(np.abs(samples).max())
+
     return builtin_max(abs(sample) for sample in _get_samples(cp, size))
 
 
 def minmax(cp, size):
     _check_params(len(cp), size)
 
-    max_sample, min_sample = 0, 0
+    if np is not None:
+        if len(cp) == 0:
+            return _get_maxval(4), _get_minval(4)
+        samples = _np_samples(cp, size)
+        return int(samples.min()), int(samples.max())
+
+    # audioop starts from the opposite 32-bit limits, even for no samples
+    max_sample, min_sample = _get_minval(4), _get_maxval(4)
     for sample in _get_samples(cp, size):
         max_sample = builtin_max(sample, max_sample)
         min_sample = builtin_min(sample, min_sample)
@@ -136,7 +202,12 @@ def avg(cp, size):
     sample_count = _sample_count(cp, size)
     if sample_count == 0:
         return 0
-    return sum(_get_samples(cp, size)) / sample_count
+
+    if np is not None:
+        total = _np_samples(cp, size).sum(dtype=np.int64)
+        return int(math.floor(float(total) / sample_count))
+
+    return sum(_get_samples(cp, size)) // sample_count
 
 
 def rms(cp, size):
@@ -146,16 +217,77 @@ def rms(cp, size):
     if sample_count == 0:
         return 0
 
+    if np is not None:
+        samples = _np_samples(cp, size)
+        # while the total can't pass 2**53, audioop's double accumulator
+        # never rounds, so an exact integer sum gives the same answer
+        if sample_count << (16 * size - 2) < 1 << 53:
+            sum_squares = float(np.square(samples, dtype=np.int64).sum())
+            return int(math.sqrt(sum_squares / sample_count))
+
+        # cumsum adds strictly left to right, like audioop's double
+        # accumulator, so 32-bit input rounds the same way
+        squares = samples.astype(np.float64)
+        np.square(squares, out=squares)
+        sum_squares = np.cumsum(squares, out=squares)[-1]
+        return int(math.sqrt(sum_squares / sample_count))
+
     sum_squares = sum(sample**2 for sample in _get_samples(cp, size))
     return int(math.sqrt(sum_squares / sample_count))
 
 
-def _sum2(cp1, cp2, length):
-    size = 2
-    total = 0
-    for i in range(length):
-        total += getsample(cp1, size, i) * getsample(cp2, size, i)
-    return total
+def _sum2(samples1, samples2, length, offset1=0):
+    window = samples1[offset1:offset1 + length]
+    return sum(a * b for a, b in zip(window, samples2[:length]))
+
+
+def _float_div(a, b):
+    """
+    a / b in doubles, the way audioop divides: by zero gives inf or nan
+    rather than raising
+    """
+    if b:
+        return float(a) / b
+    if a:
+        return math.copysign(float("inf"), a)
+    return float("nan")
+
+
+def _fit_cost(sum_ri_2, sum_aij_2, sum_aij_ri):
+    # the sums are exact integers, audioop works with them as doubles
+    sum_ri_2, sum_aij_2 = float(sum_ri_2), float(sum_aij_2)
+    sum_aij_ri = float(sum_aij_ri)
+    return _float_div(sum_ri_2 * sum_aij_2 - sum_aij_ri * sum_aij_ri,
+                      sum_aij_2)
+
+
+def _np_findfit(samples1, samples2):
+    # every offset's cross term and window energy in one pass each; the
+    # integer sums are exact so the float cost below rounds like audioop's.
+    # samples1 is squared in place once the cross terms are done with it
+    len2 = len(samples2)
+    windows = len(samples1) - len2 + 1
+    if len2:
+        sums_aij_ri = np.correlate(samples1, samples2, mode="valid")
+    else:
+        sums_aij_ri = np.zeros(windows, dtype=np.int64)
+    sums = _np_running_sum(np.square(samples1, out=samples1))
+    sums_aij_2 = (sums[len2:] - sums[:windows]).astype(np.float64)
+    sums_aij_ri = sums_aij_ri.astype(np.float64)
+    sum_ri_2 = np.float64(np.dot(samples2, samples2))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results = ((sum_ri_2 * sums_aij_2 - sums_aij_ri * sums_aij_ri) /
+                   sums_aij_2)
+        # a nan never wins a comparison, unless it is the starting best
+        if np.isnan(results[0]):
+            best_i = 0
+        else:
+            best_i = int(np.argmin(np.where(np.isnan(results), np.inf,
+                                            results)))
+        factor = float(sums_aij_ri[best_i] / sum_ri_2)
+
+    return best_i, factor
 
 
 def findfit(cp1, cp2):
@@ -170,29 +302,36 @@ def findfit(cp1, cp2):
     len1 = _sample_count(cp1, size)
     len2 = _sample_count(cp2, size)
 
-    sum_ri_2 = _sum2(cp2, cp2, len2)
-    sum_aij_2 = _sum2(cp1, cp1, len2)
-    sum_aij_ri = _sum2(cp1, cp2, len2)
+    if np is not None:
+        return _np_findfit(_np_samples(cp1, size).astype(np.int64),
+                           _np_samples(cp2, size).astype(np.int64))
+
+    samples1 = _get_array(cp1, size)
+    samples2 = _get_array(cp2, size)
+
+    sum_ri_2 = _sum2(samples2, samples2, len2)
+    sum_aij_2 = _sum2(samples1, samples1, len2)
+    sum_aij_ri = _sum2(samples1, samples2, len2)
 
-    result = (sum_ri_2 * sum_aij_2 - sum_aij_ri * sum_aij_ri) / sum_aij_2
+    result = _fit_cost(sum_ri_2, sum_aij_2, sum_aij_ri)
 
     best_result = result
     best_i = 0
 
     for i in range(1, len1 - len2 + 1):
-        aj_m1 = _get_sample(cp1, size, i - 1)
-        aj_lm1 = _get_sample(cp1, size, i + len2 - 1)
+        aj_m1 = samples1[i - 1]
+        aj_lm1 = samples1[i + len2 - 1]
 
         sum_aij_2 += aj_lm1**2 - aj_m1**2
-        sum_aij_ri = _sum2(buffer(cp1)[i*size:], cp2, len2)
+        sum_aij_ri = _sum2(samples1, samples2, len2, i)
 
-        result = (sum_ri_2 * sum_aij_2 - sum_aij_ri * sum_aij_ri) / sum_aij_2
+        result = _fit_cost(sum_ri_2, sum_aij_2, sum_aij_ri)
 
         if result < best_result:
             best_result = result
             best_i = i
 
-    factor = _sum2(buffer(cp1)[best_i*size:], cp2, len2) / sum_ri_2
+    factor = _float_div(_sum2(samples1, samples2, len2, best_i), sum_ri_2)
 
     return best_i, factor
 
@@ -207,11 +346,13 @@ def findfactor(cp1, cp2):
         raise error("Samples should be same size")
 
     sample_count = _sample_count(cp1, size)
+    samples1 = _get_array(cp1, size)
+    samples2 = _get_array(cp2, size)
 
-    sum_ri_2 = _sum2(cp2, cp2, sample_count)
-    sum_aij_ri = _sum2(cp1, cp2, sample_count)
+    sum_ri_2 = _sum2(samples2, samples2, sample_count)
+    sum_aij_ri = _sum2(samples1, samples2, sample_count)
 
-    return sum_aij_ri / sum_ri_2
+    return _float_div(sum_aij_ri, sum_ri_2)
 
 
 def findmax(cp, len2):
@@ -227,13 +368,23 @@ def findmax(cp, len2):
     if sample_count == 0:
         return 0
 
-    result = _sum2(cp, cp, len2)
+    if np is not None:
+        if len2 == 0:
+            return 0
+        # window energies for every offset at once via a running sum
+        squares = _np_samples(cp, size).astype(np.int64)
+        np.square(squares, out=squares)
+        sums = _np_running_sum(squares)
+        return int(np.argmax(sums[len2:] - sums[:-len2]))
+
+    samples = _get_array(cp, size)
+    result = _sum2(samples, samples, len2)
     best_result = result
     best_i = 0
 
     for i in range(1, sample_count - len2 + 1):
-        sample_leaving_window = getsample(cp, size, i - 1)
-        sample_entering_window = getsample(cp, size, i + len2 - 1)
+        sample_leaving_window = samples[i - 1]
+        sample_entering_window = samples[i + len2 - 1]
 
         result -= sample_leaving_window**2
         result += sample_entering_window**2
@@ -245,9 +396,39 @@ def findmax(cp, len2):
     return best_i
 
 
+def _np_swings(cp, size):
+    """
+    Absolute differences between successive extremes of the fragment,
+    found the way audioop's avgpp and maxpp do
+    """
+    samples = _np_samples(cp, size).astype(np.int64)
+    if len(samples) < 2:
+        return samples[:0]
+
+    # runs of equal samples never move the scan, so only look at changes
+    changes = np.flatnonzero(samples[1:] != samples[:-1]) + 1
+    going_down = samples[changes] < samples[changes - 1]
+
+    # the first change has no earlier direction to turn away from
+    turned = going_down[1:] != going_down[:-1]
+    extremes = samples[changes[1:][turned] - 1]
+    return np.abs(np.diff(extremes))
+
+
 def avgpp(cp, size):
     _check_params(len(cp), size)
+
+    if np is not None:
+        swings = _np_swings(cp, size)
+        if len(swings) == 0:
+            return 0
+        # cumsum adds in order, like audioop's double accumulator
+        total = np.cumsum(swings.astype(np.float64))[-1]
+        return int(total / len(swings))
+
     sample_count = _sample_count(cp, size)
+    if sample_count <= 1:
+        return 0
 
     prevextremevalid = False
     prevextreme = None
@@ -278,12 +459,19 @@ def avgpp(cp, size):
     if nextreme == 0:
         return 0
 
-    return avg / nextreme
+    return avg // nextreme
 
 
 def maxpp(cp, size):
     _check_params(len(cp), size)
+
+    if np is not None:
+        swings = _np_swings(cp, size)
+        return int(swings.max()) if len(swings) else 0
+
     sample_count = _sample_count(cp, size)
+    if sample_count <= 1:
+        return 0
 
     prevextremevalid = False
     prevextreme = None
@@ -316,24 +504,36 @@ def maxpp(cp, size):
 def cross(cp, size):
     _check_params(len(cp), size)
 
-    crossings = 0
-    last_sample = 0
+    if np is not None:
+        # audioop counts changes of the sign bit, and starts from -1
+        negative = np.signbit(_np_samples(cp, size))
+        if len(negative) == 0:
+            return -1
+        return int(np.count_nonzero(negative[1:] != negative[:-1]))
+
+    crossings = -1
+    last_negative = None
     for sample in _get_samples(cp, size):
-        if sample <= 0 < last_sample or sample >= 0 > last_sample:
+        negative = sample < 0
+        if negative != last_negative:
             crossings += 1
-        last_sample = sample
+        last_negative = negative
 
     return crossings
 
 
 def mul(cp, size, factor):
     _check_params(len(cp), size)
+
+    if np is not None:
+        return _np_clip_to_bytes(_np_samples(cp, size) * float(factor), size)
+
     clip = _get_clipfn(size)
 
     result = create_string_buffer(len(cp))
 
     for i, sample in enumerate(_get_samples(cp, size)):
-        sample = clip(int(sample * factor))
+        sample = clip(int(math.floor(sample * float(factor))))
         _put_sample(result, size, i, sample)
 
     return result.raw
@@ -341,20 +541,33 @@ def mul(cp, size, factor):
 
 def tomono(cp, size, fac1, fac2):
     _check_params(len(cp), size)
+
+    if np is not None:
+        if len(cp) % (2 * size) != 0:
+            raise error("not a whole number of frames")
+
+        # picking out one channel as is needs no arithmetic
+        if (fac1, fac2) in ((1, 0), (0, 1)):
+            return _np_samples(cp, size)[0 if fac1 else 1::2].tobytes()
+
+        frames = _np_samples(cp, size).reshape(-1, 2)
+        samples = frames[:, 0] * float(fac1) + frames[:, 1] * float(fac2)
+        return _np_clip_to_bytes(samples, size)
+
     clip = _get_clipfn(size)
 
     sample_count = _sample_count(cp, size)
 
-    result = create_string_buffer(len(cp) / 2)
+    result = create_string_buffer(len(cp) // 2)
 
     for i in range(0, sample_count, 2):
         l_sample = getsample(cp, size, i)
         r_sample = getsample(cp, size, i + 1)
 
-        sample = (l_sample * fac1) + (r_sample * fac2)
-        sample = clip(sample)
+        sample = (l_sample * float(fac1)) + (r_sample * float(fac2))
+        sample = clip(int(math.floor(sample)))
 
-        _put_sample(result, size, i / 2, sample)
+        _put_sample(result, size, i // 2, sample)
 
     return result.raw
 
@@ -362,6 +575,23 @@ def tomono(cp, size, fac1, fac2):
 def tostereo(cp, size, fac1, fac2):
     _check_params(len(cp), size)
 
+    if np is not None:
+        samples = _np_samples(cp, size)
+
+        # copying the samples into one or both channels needs no arithmetic
+        if fac1 in (0, 1) and fac2 in (0, 1):
+            frames = np.zeros((len(samples), 2), dtype=samples.dtype)
+            if fac1:
+                frames[:, 0] = samples
+            if fac2:
+                frames[:, 1] = samples
+            return frames.tobytes()
+
+        frames = np.empty((len(samples), 2))
+        frames[:, 0] = samples * float(fac1)
+        frames[:, 1] = samples * float(fac2)
+        return _np_clip_to_bytes(frames, size)
+
     sample_count = _sample_count(cp, size)
 
     result = create_string_buffer(len(cp) * 2)
@@ -370,8 +600,8 @@ def tostereo(cp, size, fac1, fac2):
     for i in range(sample_count):
         sample = _get_sample(cp, size, i)
 
-        l_sample = clip(sample * fac1)
-        r_sample = clip(sample * fac2)
+        l_sample = clip(int(math.floor(sample * float(fac1))))
+        r_sample = clip(int(math.floor(sample * float(fac2))))
 
         _put_sample(result, size, i * 2, l_sample)
         _put_sample(result, size, i * 2 + 1, r_sample)
@@ -385,42 +615,46 @@ def add(cp1, cp2, size):
     if len(cp1) != len(cp2):
         raise error("Lengths should be the same")
 
-    clip = _get_clipfn(size)
-    sample_count = _sample_count(cp1, size)
-    result = create_string_buffer(len(cp1))
-
-    for i in range(sample_count):
-        sample1 = getsample(cp1, size, i)
-        sample2 = getsample(cp2, size, i)
-
-        sample = clip(sample1 + sample2)
+    if np is not None:
+        dtype, low, high = _np_formats[size]
+        samples = np.frombuffer(cp1, dtype).astype(np.int64)
+        samples += np.frombuffer(cp2, dtype)
+        np.clip(samples, low, high, out=samples)
+        return samples.astype(dtype).tobytes()
 
-        _put_sample(result, size, i, sample)
+    # unpack both fragments in one go rather than sample by sample
+    clip = _get_clipfn(size)
+    samples1 = _get_array(cp1, size)
+    samples2 = _get_array(cp2, size)
 
-    return result.raw
+    result = array.array(samples1.typecode,
+                         [clip(a + b) for a, b in zip(samples1, samples2)])
+    return _array_to_bytes(result)
 
 
 def bias(cp, size, bias):
     _check_params(len(cp), size)
 
-    result = create_string_buffer(len(cp))
+    if np is not None:
+        # narrowing from int64 wraps around just like _overflow
+        dtype = _np_formats[size][0]
+        samples = np.frombuffer(cp, dtype).astype(np.int64)
+        samples += bias
+        return samples.astype(dtype).tobytes()
 
-    for i, sample in enumerate(_get_samples(cp, size)):
-        sample = _overflow(sample + bias, size)
-        _put_sample(result, size, i, sample)
-
-    return result.raw
+    return _wrapped_bytes((sample + bias for sample in _get_samples(cp, size)),
+                          size)
 
 
 def reverse(cp, size):
     _check_params(len(cp), size)
-    sample_count = _sample_count(cp, size)
 
-    result = create_string_buffer(len(cp))
-    for i, sample in enumerate(_get_samples(cp, size)):
-        _put_sample(result, size, sample_count - i - 1, sample)
+    if np is not None:
+        return _np_samples(cp, size)[::-1].tobytes()
 
-    return result.raw
+    samples = _get_array(cp, size)
+    samples.reverse()
+    return _array_to_bytes(samples)
 
 
 def lin2lin(cp, size, size2):
@@ -430,22 +664,80 @@ def lin2lin(cp, size, size2):
     if size == size2:
         return cp
 
-    new_len = (len(cp) / size) * size2
+    if np is not None:
+        samples = _np_samples(cp, size)
+        dtype2 = _np_formats[size2][0]
+        if size < size2:
+            samples = samples.astype(dtype2) << (8 * (size2 - size))
+        else:
+            samples = (samples >> (8 * (size - size2))).astype(dtype2)
+        return samples.tobytes()
+
+    if size < size2:
+        shifted = (sample << (8 * (size2 - size))
+                   for sample in _get_samples(cp, size))
+    else:
+        shifted = (sample >> (8 * (size - size2))
+                   for sample in _get_samples(cp, size))
 
-    result = create_string_buffer(new_len)
+    return _wrapped_bytes(shifted, size2)
 
-    for i in range(_sample_count(cp, size)):
-        sample = _get_sample(cp, size, i)
-        if size < size2:
-            sample = sample << (4 * size2 / size)
-        elif size > size2:
-            sample = sample >> (4 * size / size2)
 
-        sample = _overflow(sample, size2)
+def _np_ratecv(cp, size, nchannels, inrate, outrate, state, weightA,
+               weightB):
+    d = gcd(inrate, outrate)
+    inrate //= d
+    outrate //= d
 
-        _put_sample(result, size2, i, sample)
+    if state is None:
+        d = -outrate
+        prev_i = cur_i = [0] * nchannels
+    else:
+        d, samps = state
+        if len(samps) != nchannels:
+            raise error("illegal state argument")
+        prev_i, cur_i = zip(*samps)
 
-    return result.raw
+    # audioop interpolates on samples scaled up to 32 bits
+    shift = 32 - 8 * size
+    frames = _np_samples(cp, size).astype(np.int64).reshape(-1, nchannels)
+    frames <<= shift
+
+    if weightB:
+        # the input filter feeds back on itself, so it has to be a loop
+        weight_a, weight_b = float(weightA), float(weightB)
+        weight_sum = float(weightA + weightB)
+        filtered = frames.tolist()
+        last = list(cur_i)
+        for frame in filtered:
+            for chan in range(nchannels):
+                last[chan] = frame[chan] = int(
+                    (weight_a * frame[chan] + weight_b * last[chan]) /
+                    weight_sum)
+        frames = np.array(filtered, dtype=np.int64).reshape(-1, nchannels)
+
+    # inputs as the state machine sees them: prev, cur, then each frame
+    inputs = np.concatenate((np.array([prev_i, cur_i], dtype=np.int64),
+                             frames))
+    frame_count = len(frames)
+
+    # output j is written once enough input frames have been consumed to
+    # bring d back to >= 0, which pins down both the frame pair it
+    # interpolates between and the value of d at that moment
+    out_count = builtin_max((frame_count * outrate + d) // inrate + 1, 0)
+    out_d = np.arange(out_count, dtype=np.int64) * -inrate + d
+    consumed = np.maximum(-(out_d // outrate), 0)
+    out_d += consumed * outrate
+
+    out_d = out_d[:, np.newaxis].astype(np.float64)
+    result = (inputs[consumed].astype(np.float64) * out_d +
+              inputs[consumed + 1].astype(np.float64) * (outrate - out_d))
+    result = np.trunc(result / outrate).astype(np.int64) >> shift
+    result = result.astype(_np_formats[size][0]).tobytes()
+
+    d += frame_count * outrate - out_count * inrate
+    samps = zip(inputs[frame_count].tolist(), inputs[frame_count + 1].tolist())
+    return (result, (d, tuple(samps)))
 
 
 def ratecv(cp, size, nchannels, inrate, outrate, state, weightA=1, weightB=0):
@@ -454,7 +746,7 @@ def ratecv(cp, size, nchannels, inrate, outrate, state, weightA=1, weightB=0):
         raise error("# of channels should be >= 1")
 
     bytes_per_frame = size * nchannels
-    frame_count = len(cp) / bytes_per_frame
+    frame_count = len(cp) // bytes_per_frame
 
     if bytes_per_frame / nchannels != size:
         raise OverflowError("width * nchannels too big for a C int")
@@ -468,9 +760,13 @@ def ratecv(cp, size, nchannels, inrate, outrate, state, weightA=1, weightB=0):
     if inrate <= 0 or outrate <= 0:
         raise error("sampling rate not > 0")
 
+    if np is not None:
+        return _np_ratecv(cp, size, nchannels, inrate, outrate, state,
+                          weightA, weightB)
+
     d = gcd(inrate, outrate)
-    inrate /= d
-    outrate /= d
+    inrate //= d
+    outrate //= d
 
     prev_i = [0] * nchannels
     cur_i = [0] * nchannels
@@ -486,7 +782,12 @@ def ratecv(cp, size, nchannels, inrate, outrate, state, weightA=1, weightB=0):
         prev_i, cur_i = zip(*samps)
         prev_i, cur_i = list(prev_i), list(cur_i)
 
-    q = frame_count / inrate
+    # audioop interpolates on samples scaled up to 32 bits, in doubles
+    shift = 32 - 8 * size
+    weight_a, weight_b = float(weightA), float(weightB)
+    weight_sum = float(weightA + weightB)
+
+    q = frame_count // inrate
     ceiling = (q + 1) * outrate
     nbytes = ceiling * bytes_per_frame
 
@@ -498,21 +799,19 @@ def ratecv(cp, size, nchannels, inrate, outrate, state, weightA=1, weightB=0):
         while d < 0:
             if frame_count == 0:
                 samps = zip(prev_i, cur_i)
-                retval = result.raw
 
                 # slice off extra bytes
-                trim_index = (out_i * bytes_per_frame) - len(retval)
-                retval = buffer(retval)[:trim_index]
+                retval = memoryview(result)[:out_i * size].tobytes()
 
                 return (retval, (d, tuple(samps)))
 
             for chan in range(nchannels):
                 prev_i[chan] = cur_i[chan]
-                cur_i[chan] = samples.next()
+                cur_i[chan] = next(samples) << shift
 
-                cur_i[chan] = (
-                    (weightA * cur_i[chan] + weightB * prev_i[chan])
-                    / (weightA + weightB)
+                cur_i[chan] = int(
+                    (weight_a * cur_i[chan] + weight_b * prev_i[chan])
+                    / weight_sum
                 )
 
             frame_count -= 1
@@ -520,21 +819,78 @@ def ratecv(cp, size, nchannels, inrate, outrate, state, weightA=1, weightB=0):
 
         while d >= 0:
             for chan in range(nchannels):
-                cur_o = (
-                    (prev_i[chan] * d + cur_i[chan] * (outrate - d))
-                    / outrate
+                cur_o = int(
+                    (float(prev_i[chan]) * d +
+                     float(cur_i[chan]) * (outrate - d)) / outrate
                 )
-                _put_sample(result, size, out_i, _overflow(cur_o, size))
+                _put_sample(result, size, out_i, cur_o >> shift)
                 out_i += 1
             d -= inrate
 
 
+def _ulaw2linear16(u_val):
+    u_val = ~u_val & 0xff
+    exponent = (u_val >> 4) & 0x07
+    sample = (((u_val & 0x0f) << 3) + 0x84) << exponent
+    return 0x84 - sample if u_val & 0x80 else sample - 0x84
+
+
+def _alaw2linear16(a_val):
+    a_val ^= 0x55
+    segment = (a_val & 0x70) >> 4
+    sample = (a_val & 0x0f) << 4
+    if segment == 0:
+        sample += 8
+    else:
+        sample = (sample + 0x108) << (segment - 1)
+    return sample if a_val & 0x80 else -sample
+
+
+_to_lin_tables = {
+    "ulaw": [_ulaw2linear16(i) for i in range(256)],
+    "alaw": [_alaw2linear16(i) for i in range(256)],
+}
+_to_lin_np = {}
+_to_lin_lists = {}
+
+
+def _to_lin(encoding, cp, size):
+    _check_size(size)
+
+    # the tables hold 16 bit samples, move them to the requested width
+    shift = 8 * (size - 2)
+    if np is not None:
+        table = _to_lin_np.get((encoding, size))
+        if table is None:
+            table = np.asarray(_to_lin_tables[encoding], dtype=np.int32)
+            table = table << shift if shift > 0 else table >> -shift
+            table = table.astype(_np_formats[size][0])
+            _to_lin_np[(encoding, size)] = table
+        return table[np.frombuffer(cp, dtype=np.uint8)].tobytes()
+
+    table = _to_lin_lists.get((encoding, size))
+    if table is None:
+        table = [val << shift if shift > 0 else val >> -shift
+                 for val in _to_lin_tables[encoding]]
+        if size == 1:
+            # byte to byte, which bytes.translate() does in one call
+            table = _array_to_bytes(array.array("b", table))
+        _to_lin_lists[(encoding, size)] = table
+
+    if size == 1:
+        return bytes(cp).translate(table)
+
+    samples = array.array(_struct_format(size, True),
+                          [table[val] for val in bytearray(cp)])
+    return _array_to_bytes(samples)
+
+
 def lin2ulaw(cp, size):
     raise NotImplementedError()
 
 
 def ulaw2lin(cp, size):
-    raise NotImplementedError()
+    return _to_lin("ulaw", cp, size)
 
 
 def lin2alaw(cp, size):
@@ -542,7 +898,7 @@ def lin2alaw(cp, size):
 
 
 def alaw2lin(cp, size):
-    raise NotImplementedError()
+    return _to_lin("alaw", cp, size)
 
 
 def lin2adpcm(cp, size, state):
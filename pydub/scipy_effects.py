@@ -9,8 +9,43 @@ will be used when calling audio_segment.high_pass_filter() and
 audio_segment.high_pass_filter() instead of the slower, less powerful versions
 provided by pydub.effects.
 """
+import numpy as np
 from scipy.signal import butter, sosfilt
 from .utils import (register_pydub_effect,stereo_to_ms,ms_to_stereo)
+from .audio_segment import _thread_pool
+
+
+# samples filtered per sosfilt call, the filter state carries across calls
+_FILTER_BLOCK = 1 << 16
+
+
+_butter_designs = {}
+
+
+def _butter_design(order, freq, type, frame_rate):
+    """
+    butter() second-order sections for the filter, designing each distinct
+    filter only once
+    """
+    try:
+        key = (order, tuple(freq), type, frame_rate)
+    except TypeError:
+        key = (order, freq, type, frame_rate)
+
+    sos = _butter_designs.get(key)
+    if sos is None:
+        nyq = 0.5 * frame_rate
+        try:
+            freqs = [f / nyq for f in freq]
+        except TypeError:
+            freqs = freq / nyq
+
+        sos = butter(order, freqs, btype=type, output='sos')
+        if len(_butter_designs) >= 64:
+            _butter_designs.clear()
+        _butter_designs[key] = sos
+
+    return sos
 
 
 def _mk_butter_filter(freq, type, order):
@@ -32,36 +67,88 @@ def _mk_butter_filter(freq, type, order):
     def filter_fn(seg):
         assert seg.channels == 1
 
-        nyq = 0.5 * seg.frame_rate
-        try:
-            freqs = [f / nyq for f in freq]
-        except TypeError:
-            freqs = freq / nyq
+        sos = _butter_design(order, freq, type, seg.frame_rate)
 
-        sos = butter(order, freqs, btype=type, output='sos')
-        y = sosfilt(sos, seg.get_array_of_samples())
+        # filter a block at a time so only one block's worth of float64
+        # intermediates is alive, rather than a copy of the whole segment
+        samples = seg.get_samples_numpy()
+        y = np.empty_like(samples)
+        limits = np.iinfo(y.dtype)
+        zi = np.zeros((sos.shape[0], 2))
+        for start in range(0, len(samples), _FILTER_BLOCK):
+            end = start + _FILTER_BLOCK
+            filtered, zi = sosfilt(sos, samples[start:end], zi=zi)
+
+            # the filters can ring past full scale, saturate those samples
+            # rather than letting them wrap around. Clipping in place and
+            # casting on assignment avoids another temporary per block
+            np.clip(filtered, limits.min, limits.max, out=filtered)
+            y[start:end] = filtered
 
-        return seg._spawn(y.astype(seg.array_type))
+        return seg._spawn(y.tobytes())
 
     return filter_fn
 
 
+def _apply_parallel(seg, filter_fn):
+    """
+    Same as seg.apply_mono_filter_to_each_channel(filter_fn) but filters the
+    channels concurrently (sosfilt releases the GIL) when there's enough
+    audio for that to be worthwhile
+    """
+    executor = _thread_pool(len(seg._data))
+    if executor is None or seg.channels == 1:
+        return seg.apply_mono_filter_to_each_channel(filter_fn)
+
+    channel_segs = list(executor.map(filter_fn, seg.split_to_mono()))
+    return seg._spawn(seg.from_mono_audiosegments(*channel_segs)._data)
+
+
 @register_pydub_effect
 def band_pass_filter(seg, low_cutoff_freq, high_cutoff_freq, order=5):
     filter_fn = _mk_butter_filter([low_cutoff_freq, high_cutoff_freq], 'band', order=order)
-    return seg.apply_mono_filter_to_each_channel(filter_fn)
+    return _apply_parallel(seg, filter_fn)
 
 
 @register_pydub_effect
 def high_pass_filter(seg, cutoff_freq, order=5):
     filter_fn = _mk_butter_filter(cutoff_freq, 'highpass', order=order)
-    return seg.apply_mono_filter_to_each_channel(filter_fn)
+    return _apply_parallel(seg, filter_fn)
 
 
 @register_pydub_effect
 def low_pass_filter(seg, cutoff_freq, order=5):
     filter_fn = _mk_butter_filter(cutoff_freq, 'lowpass', order=order)
-    return seg.apply_mono_filter_to_each_channel(filter_fn)
+    return _apply_parallel(seg, filter_fn)
+
+
+# the band _eq boosts for each mode
+_EQ_BOOSTS = {
+    "peak": lambda seg, focus_freq, bandwidth, order: band_pass_filter(
+        seg, focus_freq - bandwidth/2, focus_freq + bandwidth/2, order=order),
+    "low_shelf": lambda seg, focus_freq, bandwidth, order: low_pass_filter(
+        seg, focus_freq, order=order),
+    "high_shelf": lambda seg, focus_freq, bandwidth, order: high_pass_filter(
+        seg, focus_freq, order=order),
+}
+
+# the bands _eq keeps, one after the other, when cutting for each mode
+_EQ_CUTS = {
+    "peak": [
+        lambda seg, focus_freq, bandwidth, order: high_pass_filter(
+            seg, focus_freq - bandwidth/2, order=order),
+        lambda seg, focus_freq, bandwidth, order: low_pass_filter(
+            seg, focus_freq + bandwidth/2, order=order),
+    ],
+    "low_shelf": [
+        lambda seg, focus_freq, bandwidth, order: high_pass_filter(
+            seg, focus_freq, order=order),
+    ],
+    "high_shelf": [
+        lambda seg, focus_freq, bandwidth, order: low_pass_filter(
+            seg, focus_freq, order=order),
+    ],
+}
 
 
 @register_pydub_effect
@@ -76,44 +163,18 @@ def _eq(seg, focus_freq, bandwidth=100, mode="peak", gain_dB=0, order=2):
     Returns:
         Equalized/Filtered AudioSegment
     """
-    filt_mode = ["peak", "low_shelf", "high_shelf"]
-    if mode not in filt_mode:
+    if mode not in _EQ_BOOSTS:
         raise ValueError("Incorrect Mode Selection")
-        
+
     if gain_dB >= 0:
-        if mode == "peak":
-            sec = band_pass_filter(seg, focus_freq - bandwidth/2, focus_freq + bandwidth/2, order = order)
-            seg = seg.overlay(sec - (3 - gain_dB))
-            return seg
-        
-        if mode == "low_shelf":
-            sec = low_pass_filter(seg, focus_freq, order=order)
-            seg = seg.overlay(sec - (3 - gain_dB))
-            return seg
-        
-        if mode == "high_shelf":
-            sec = high_pass_filter(seg, focus_freq, order=order)
-            seg = seg.overlay(sec - (3 - gain_dB))
-            return seg
-        
-    if gain_dB < 0:
-        if mode == "peak":
-            sec = high_pass_filter(seg, focus_freq - bandwidth/2, order=order)
-            seg = seg.overlay(sec - (3 + gain_dB)) + gain_dB
-            sec = low_pass_filter(seg, focus_freq + bandwidth/2, order=order)
-            seg = seg.overlay(sec - (3 + gain_dB)) + gain_dB
-            return seg
-        
-        if mode == "low_shelf":
-            sec = high_pass_filter(seg, focus_freq, order=order)
-            seg = seg.overlay(sec - (3 + gain_dB)) + gain_dB
-            return seg
-        
-        if mode=="high_shelf":
-            sec=low_pass_filter(seg, focus_freq, order=order)
-            seg=seg.overlay(sec - (3 + gain_dB)) +gain_dB
-            return seg
-        
+        sec = _EQ_BOOSTS[mode](seg, focus_freq, bandwidth, order)
+        return seg.overlay(sec - (3 - gain_dB))
+
+    for band_filter in _EQ_CUTS[mode]:
+        sec = band_filter(seg, focus_freq, bandwidth, order)
+        seg = seg.overlay(sec - (3 + gain_dB)) + gain_dB
+    return seg
+
 
 @register_pydub_effect
 def eq(seg, focus_freq, bandwidth=100, channel_mode="L+R", filter_mode="peak", gain_dB=0, order=2):
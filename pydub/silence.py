@@ -3,7 +3,12 @@ Various functions for finding/manipulating silence in AudioSegments
 """
 import itertools
 
-from .utils import db_to_float
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .utils import db_to_float, ratio_to_db, get_array_type, audioop
 
 
 def detect_silence(audio_segment, min_silence_len=1000, silence_thresh=-16, seek_step=1):
@@ -33,15 +38,26 @@ def detect_silence(audio_segment, min_silence_len=1000, silence_thresh=-16, seek
     last_slice_start = seg_len - min_silence_len
     slice_starts = range(0, last_slice_start + 1, seek_step)
 
+    # slices that don't overlap are quicker to hand to audioop.rms one at a
+    # time than to cover with a running sum, unless they're only a few frames
+    # long each
+    non_overlapping = seek_step >= min_silence_len and \
+        min_silence_len * audio_segment.frame_rate >= _AUDIOOP_MIN_FRAMES * 1000
+
+    if np is not None and min_silence_len > 0 and not non_overlapping:
+        silent_ranges = _np_silent_ranges(audio_segment, last_slice_start,
+                                          min_silence_len, silence_thresh,
+                                          seek_step)
+        if silent_ranges is not None:
+            return silent_ranges
+
     # guarantee last_slice_start is included in the range
     # to make sure the last portion of the audio is searched
     if last_slice_start % seek_step:
         slice_starts = itertools.chain(slice_starts, [last_slice_start])
 
-    for i in slice_starts:
-        audio_slice = audio_segment[i:i + min_silence_len]
-        if audio_slice.rms <= silence_thresh:
-            silence_starts.append(i)
+    silence_starts = _silent_slice_starts(audio_segment, list(slice_starts),
+                                          min_silence_len, silence_thresh)
 
     # short circuit when there is no silence
     if not silence_starts:
@@ -73,6 +89,318 @@ def detect_silence(audio_segment, min_silence_len=1000, silence_thresh=-16, seek
     return silent_ranges
 
 
+# frames a slice needs before audioop.rms beats the running sum of squares
+_AUDIOOP_MIN_FRAMES = 128
+
+
+def _np_silent_ranges(audio_segment, last_slice_start, min_silence_len,
+                      silence_thresh, seek_step):
+    """
+    detect_silence() done with arrays from start to finish: the slice starts,
+    which are silent and where the silent ranges break. Returns None when
+    _sliding_silence() can't be used.
+    """
+    slice_starts = np.arange(0, last_slice_start + 1, seek_step)
+    if last_slice_start % seek_step:
+        slice_starts = np.append(slice_starts, last_slice_start)
+
+    silent = _sliding_silence(audio_segment, slice_starts, min_silence_len,
+                              silence_thresh)
+    if silent is None:
+        return None
+
+    silence_starts = slice_starts[silent]
+    if not len(silence_starts):
+        return []
+
+    # a range ends wherever the next silent slice neither follows on by one
+    # seek step nor overlaps the current one
+    gaps = np.diff(silence_starts)
+    breaks = np.flatnonzero((gaps != seek_step) & (gaps > min_silence_len))
+    range_starts = silence_starts[np.concatenate(([0], breaks + 1))]
+    range_ends = silence_starts[np.concatenate((breaks, [-1]))] + min_silence_len
+    return np.column_stack((range_starts, range_ends)).tolist()
+
+
+def _silent_slice_starts(audio_segment, slice_starts, slice_len, silence_thresh):
+    """
+    Returns the slice_starts whose slice_len ms of audio_segment have an rms
+    no higher than silence_thresh.
+    """
+    sample_width = audio_segment.sample_width
+    slice_data = audio_segment._slice_data
+    return [i for i in slice_starts
+            if audioop.rms(slice_data(i, i + slice_len), sample_width) <= silence_thresh]
+
+
+def _sliding_silence(audio_segment, slice_starts, slice_len, silence_thresh):
+    """
+    Whether each slice_len ms slice of audio_segment starting at slice_starts
+    has an rms no higher than silence_thresh, or None when _rms_between()
+    can't work it out exactly.
+
+    Slices whose surrounding blocks already settle it either way are decided
+    from those alone, only the rest need their rms.
+    """
+    starts = np.array(slice_starts)
+    frames = _slice_frames(audio_segment, starts, starts + slice_len)
+    if frames is None:
+        return None
+    first_frames, last_frames, sample_counts = frames
+
+    silent, loud = _silent_or_loud_by_blocks(audio_segment, first_frames,
+                                             last_frames, sample_counts,
+                                             silence_thresh)
+    undecided = np.flatnonzero(~(silent | loud))
+    rms = _rms_between(audio_segment, first_frames[undecided],
+                       last_frames[undecided], sample_counts[undecided])
+    if rms is None:
+        return None
+
+    silent[undecided] = rms <= silence_thresh
+    return silent
+
+
+def _slices_rms(audio_segment, starts, ends):
+    """
+    The rms of audio_segment between each of the starts and ends (arrays of
+    positions in ms), or None when _rms_between() can't work it out exactly.
+    """
+    frames = _slice_frames(audio_segment, starts, ends)
+    if frames is None:
+        return None
+    return _rms_between(audio_segment, *frames)
+
+
+def _slice_frames(audio_segment, starts, ends):
+    """
+    The first and last frames and the sample count (once padded with silence)
+    of audio_segment between each of the starts and ends (arrays of positions
+    in ms), or None if any slice is missing too much data.
+
+    The slice bounds and padding match audio_segment[start:end], so the rms
+    _rms_between() works out from them is identical to audioop.rms of the
+    slice's raw data.
+    """
+    frames_per_ms = audio_segment.frame_rate / 1000.0
+    frame_count = len(audio_segment._data) // audio_segment.frame_width
+
+    start_frames = (starts * frames_per_ms).astype(np.int64)
+    end_frames = (ends * frames_per_ms).astype(np.int64)
+
+    # slices missing too much data are left to _slice_data to complain about
+    if len(starts) and (end_frames - frame_count).max() > 2 * frames_per_ms:
+        return None
+
+    # slices are cut off at the end of the data and padded back out with
+    # silence (which adds to the sample count, but not the sum)
+    first_frames = np.minimum(start_frames, frame_count)
+    last_frames = np.maximum(np.minimum(end_frames, frame_count), first_frames)
+    sample_counts = (end_frames - start_frames) * audio_segment.channels
+    return first_frames, last_frames, sample_counts
+
+
+# frames in each block _silent_or_loud_by_blocks() sums the squares of
+_ENERGY_BLOCK = 256
+
+
+def _silent_or_loud_by_blocks(audio_segment, first_frames, last_frames,
+                              sample_counts, silence_thresh):
+    """
+    Two boolean arrays of the slices (as for _rms_between()) that are
+    certainly silent and certainly loud, going only by the sums of squares of
+    the _ENERGY_BLOCK frame blocks around and inside each slice.
+
+    A slice's sum of squares is somewhere between that of the blocks wholly
+    inside it and that of all the blocks it touches. The rms only grows with
+    the sum, so when both bounds land on the same side of silence_thresh, so
+    does the slice. Only slices near a change in level are left undecided.
+    """
+    silent = np.zeros(len(first_frames), dtype=bool)
+    loud = np.zeros(len(first_frames), dtype=bool)
+    if not len(first_frames) or not _rms_is_exact(audio_segment, sample_counts):
+        return silent, loud
+
+    sums = _running_sum_of_block_squares(_samples(audio_segment),
+                                         _ENERGY_BLOCK * audio_segment.channels)
+    first_touched = first_frames // _ENERGY_BLOCK
+    last_touched = -(-last_frames // _ENERGY_BLOCK)
+    first_inner = np.minimum(-(-first_frames // _ENERGY_BLOCK), last_touched)
+    last_inner = np.maximum(last_frames // _ENERGY_BLOCK, first_inner)
+
+    nonempty = last_frames > first_frames
+    sample_counts = np.where(nonempty, sample_counts, 1).astype(np.float64)
+    upper = sums[last_touched] - sums[first_touched]
+    lower = sums[last_inner] - sums[first_inner]
+    silent[nonempty] = (np.sqrt(upper / sample_counts).astype(np.int64) <=
+                        silence_thresh)[nonempty]
+    loud[nonempty] = (np.sqrt(lower / sample_counts).astype(np.int64) >
+                      silence_thresh)[nonempty]
+    return silent, loud
+
+
+def _running_sum_of_block_squares(samples, block_len):
+    """
+    Returns an int64 array where element i is the sum of the squares of the
+    samples in the first i blocks of block_len samples (the last block can
+    be shorter). Like _running_sum_of_squares(), a block at a time.
+    """
+    block_count = -(-len(samples) // block_len)
+    sums = np.empty(block_count + 1, dtype=np.int64)
+    sums[0] = 0
+
+    step = max(_SQUARES_BLOCK // block_len, 1) * block_len
+    squares = np.empty(min(len(samples), step), dtype=np.int64)
+    for i in range(0, len(samples), step):
+        chunk = samples[i:i + step]
+        chunk_squares = squares[:len(chunk)]
+        np.square(chunk, out=chunk_squares, dtype=np.int64)
+
+        first_block = i // block_len + 1
+        whole_blocks = len(chunk) // block_len
+        whole_squares = chunk_squares[:whole_blocks * block_len]
+        sums[first_block:first_block + whole_blocks] = \
+            whole_squares.reshape(whole_blocks, block_len).sum(axis=1)
+        if len(chunk) % block_len:
+            sums[-1] = chunk_squares[whole_blocks * block_len:].sum()
+
+    np.cumsum(sums, out=sums)
+    return sums
+
+
+def _rms_is_exact(audio_segment, sample_counts):
+    """
+    Whether a running sum of squared samples gives exactly audioop's rms for
+    slices sample_counts samples long: squares of 16-bit samples are up to
+    2**30, the running sum has to fit an int64 and each slice's sum a double.
+    """
+    frame_count = len(audio_segment._data) // audio_segment.frame_width
+    return audio_segment.sample_width <= 2 and \
+        frame_count * audio_segment.channels < 2 ** 32 and \
+        not (len(sample_counts) and sample_counts.max() >= 2 ** 22)
+
+
+def _samples(audio_segment):
+    """
+    The samples of audio_segment's whole frames, as an array over its data.
+    """
+    frame_count = len(audio_segment._data) // audio_segment.frame_width
+    return np.frombuffer(audio_segment._data,
+                         dtype=get_array_type(audio_segment.sample_width * 8),
+                         count=frame_count * audio_segment.channels)
+
+
+def _rms_between(audio_segment, first_frames, last_frames, sample_counts):
+    """
+    audioop.rms of the frames from first_frames up to last_frames (arrays of
+    frame indexes) of audio_segment, where each slice is sample_counts
+    samples long once padded with silence. Empty slices have an rms of 0.
+
+    Every rms comes from a running sum of squared samples. Returns None
+    when that wouldn't be exact (see _rms_is_exact()).
+    """
+    channels = audio_segment.channels
+    if not _rms_is_exact(audio_segment, sample_counts):
+        return None
+
+    samples = _samples(audio_segment)
+
+    empty = last_frames <= first_frames
+    last_frames = np.maximum(last_frames, first_frames)
+    squares = _sums_of_squares_between(samples, first_frames * channels,
+                                       last_frames * channels)
+    sample_counts = np.where(empty, 1, sample_counts).astype(np.float64)
+
+    rms = np.sqrt(squares / sample_counts).astype(np.int64)
+    rms[empty] = 0
+    return rms
+
+
+# samples the running sum of squares covers at any one time, as long as the
+# slices move forward through the audio
+_SUMS_SPAN = 1 << 22
+
+
+def _sums_of_squares_between(samples, starts, ends):
+    """
+    The sum of the squares of samples[start:end] for each of the starts and
+    ends (arrays of sample indexes, with ends >= starts).
+
+    When both only ever move forward, the running sum behind this covers
+    about _SUMS_SPAN samples at a time rather than the whole audio: the part
+    the slices have moved past is dropped, and only the samples they move on
+    to are squared and added, so no sample is squared twice. Stretches
+    between slices that are long enough to be worth skipping aren't squared
+    at all.
+    """
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+
+    if (np.diff(starts) < 0).any() or (np.diff(ends) < 0).any():
+        base = starts.min()
+        sums = _running_sum_of_squares(samples[base:ends.max()])
+        return sums[ends - base] - sums[starts - base]
+
+    # slices that start well past where the one before ended
+    skips = np.append(np.flatnonzero(starts[1:] - ends[:-1] >= _SQUARES_BLOCK) + 1,
+                      len(starts))
+
+    sums_of_squares = np.empty(len(starts), dtype=np.int64)
+    # sums[k] is the running sum up to samples[base + k]
+    base, sums = starts[0], np.zeros(1, dtype=np.int64)
+    i = 0
+    while i < len(starts):
+        # the slices that fit in the next span (at least one of them), up to
+        # the next skip
+        j = max(np.searchsorted(ends, starts[i] + _SUMS_SPAN, 'right'), i + 1)
+        j = min(j, skips[np.searchsorted(skips, i, 'right')])
+        first, last = starts[i], ends[j - 1]
+        summed_to = base + len(sums) - 1
+        if first >= summed_to:
+            sums = _running_sum_of_squares(samples[first:last])
+        else:
+            kept = sums[first - base:]
+            sums = np.empty(len(kept) + last - summed_to, dtype=np.int64)
+            sums[:len(kept)] = kept
+            _running_sum_of_squares(samples[summed_to:last],
+                                    sums[len(kept) - 1:])
+        base = first
+
+        sums_of_squares[i:j] = sums[ends[i:j] - base] - sums[starts[i:j] - base]
+        i = j
+
+    return sums_of_squares
+
+
+# samples squared and summed at a time, small enough that the squares stay in
+# cache until they're added to the running sum
+_SQUARES_BLOCK = 1 << 15
+
+
+def _running_sum_of_squares(samples, sums=None):
+    """
+    Returns an int64 array where element i is the sum of the squares of the
+    first i samples, built a block at a time so that no temporary array the
+    size of the audio is needed.
+
+    When sums is passed in, the running sum is written into it instead,
+    carrying on from the total already in sums[0].
+    """
+    if sums is None:
+        sums = np.empty(len(samples) + 1, dtype=np.int64)
+        sums[0] = 0
+    squares = np.empty(min(len(samples), _SQUARES_BLOCK), dtype=np.int64)
+    for i in range(0, len(samples), _SQUARES_BLOCK):
+        block = samples[i:i + _SQUARES_BLOCK]
+        block_squares = squares[:len(block)]
+        np.square(block, out=block_squares, dtype=np.int64)
+        # carry the total so far in through the first square rather than
+        # adding it to the whole block afterwards
+        block_squares[0] += sums[i]
+        np.cumsum(block_squares, out=sums[i + 1:i + 1 + len(block)])
+    return sums
+
+
 def detect_nonsilent(audio_segment, min_silence_len=1000, silence_thresh=-16, seek_step=1):
     """
     Returns a list of all nonsilent sections [start, end] in milliseconds of audio_segment.
@@ -173,10 +501,79 @@ def detect_leading_silence(sound, silence_threshold=-50.0, chunk_size=10):
     """
     trim_ms = 0 # ms
     assert chunk_size > 0 # to avoid infinite loop
-    while sound[trim_ms:trim_ms+chunk_size].dBFS < silence_threshold and trim_ms < len(sound):
+    seg_len = len(sound)
+
+    # chunks only a few frames long are quicker to check a batch at a time
+    if np is not None and isinstance(chunk_size, int) and \
+            chunk_size * sound.frame_rate < _AUDIOOP_MIN_FRAMES * 1000:
+        leading_silence = _np_leading_silence(sound, silence_threshold, chunk_size)
+        if leading_silence is not None:
+            return leading_silence
+
+    # compare each chunk's rms straight from the raw data rather than
+    # building an AudioSegment for it to work out its dBFS
+    loud_rms = _quietest_loud_rms(sound, silence_threshold)
+    sample_width = sound.sample_width
+    while trim_ms < seg_len:
+        chunk_data = sound._slice_data(trim_ms, min(trim_ms + chunk_size, seg_len))
+        if audioop.rms(chunk_data, sample_width) >= loud_rms:
+            break
         trim_ms += chunk_size
 
     # if there is no end it should return the length of the segment
-    return min(trim_ms, len(sound))
+    return min(trim_ms, seg_len)
+
+
+# chunks detect_leading_silence() checks in its first batch, doubling each
+# batch after that up to _LEADING_BATCH_MAX
+_LEADING_BATCH = 64
+_LEADING_BATCH_MAX = 1 << 16
 
 
+def _np_leading_silence(sound, silence_threshold, chunk_size):
+    """
+    detect_leading_silence() done a batch of chunks at a time, so loud audio
+    near the start is found without looking at the rest. Returns None when
+    _slices_rms() can't be used.
+    """
+    seg_len = len(sound)
+    loud_rms = _quietest_loud_rms(sound, silence_threshold)
+
+    batch_start, batch = 0, _LEADING_BATCH
+    while batch_start < seg_len:
+        batch_end = min(batch_start + batch * chunk_size, seg_len)
+        starts = np.arange(batch_start, batch_end, chunk_size)
+        # the last chunk is cut off at the end of the segment
+        rms = _slices_rms(sound, starts, np.minimum(starts + chunk_size, seg_len))
+        if rms is None:
+            return None
+
+        loud = np.flatnonzero(rms >= loud_rms)
+        if len(loud):
+            return int(starts[loud[0]])
+        batch_start = batch_end
+        batch = min(batch * 2, _LEADING_BATCH_MAX)
+
+    return seg_len
+
+
+def _quietest_loud_rms(sound, silence_threshold):
+    """
+    The lowest rms whose dBFS (worked out the same way as AudioSegment.dBFS)
+    is not below silence_threshold, so chunks can be compared by rms alone.
+    """
+    max_amplitude = sound.max_possible_amplitude
+
+    def is_silent(rms):
+        dBFS = ratio_to_db(rms / max_amplitude) if rms else -float("infinity")
+        return dBFS < silence_threshold
+
+    # rms can't go above max_amplitude, so anything past it is never reached
+    low, high = 0, int(max_amplitude) + 1
+    while low < high:
+        middle = (low + high) // 2
+        if is_silent(middle):
+            low = middle + 1
+        else:
+            high = middle
+    return low
@@ -140,11 +140,54 @@ def make_chunks(audio_segment, chunk_length):
     if chunk_length is 50 then you'll get a list of 50 millisecond long audio
     segments back (except the last one, which can be shorter)
     """
+    return list(iter_chunks(audio_segment, chunk_length))
+
+
+def iter_chunks(audio_segment, chunk_length):
+    """
+    Like make_chunks(), but yields the chunks one at a time instead of
+    building them all up front, so only the chunk in use is held in memory.
+    """
     number_of_chunks = ceil(len(audio_segment) / float(chunk_length))
-    return [audio_segment[i * chunk_length:(i + 1) * chunk_length]
-            for i in range(int(number_of_chunks))]
+    for i in range(int(number_of_chunks)):
+        yield audio_segment[i * chunk_length:(i + 1) * chunk_length]
+
+
+# the caches filled by _memoize(), so _cache_clear() can empty them all
+_memoized_caches = []
+
+
+def _memoize(func):
+    """
+    Caches func's result for each set of arguments. The program lookups below
+    walk the whole PATH, so they're only redone once PATH or the working
+    directory (which which() also searches) changes.
+    """
+    cache = {}
+    _memoized_caches.append(cache)
+
+    @wraps(func)
+    def memoized(*args):
+        key = (args, os.environ.get("PATH"), os.getcwd())
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = func(*args)
+            return result
+
+    return memoized
+
+
+def _cache_clear():
+    """
+    Forgets the cached program lookups, e.g. after installing a program into
+    a directory that's already on PATH.
+    """
+    for cache in _memoized_caches:
+        cache.clear()
 
 
+@_memoize
 def which(program):
     """
     Mimics behavior of UNIX which command.
@@ -161,6 +204,7 @@ def which(program):
             return program_path
 
 
+@_memoize
 def get_encoder_name():
     """
     Return enconder default application for system, either avconv or ffmpeg
@@ -175,6 +219,7 @@ def get_encoder_name():
         return "ffmpeg"
 
 
+@_memoize
 def get_player_name():
     """
     Return enconder default application for system, either avconv or ffmpeg
@@ -189,6 +234,7 @@ def get_player_name():
         return "ffplay"
 
 
+@_memoize
 def get_prober_name():
     """
     Return probe application, either avconv or ffmpeg
@@ -324,6 +370,10 @@ def mediainfo_json(filepath, read_ahead_limit=-1):
     return info
 
 
+# matches the "[inner_dict:]key=value" lines of ffprobe/avprobe's old output
+_MEDIAINFO_RGX = re.compile(r"(?:(?P<inner_dict>.*?):)?(?P<key>.*?)\=(?P<value>.*?)$")
+
+
 def mediainfo(filepath):
     """Return dictionary with media info(codec, duration, size, bitrate...) from filepath
     """
@@ -344,7 +394,6 @@ def mediainfo(filepath):
         command = [prober] + command_args
         output = Popen(command, stdout=PIPE).communicate()[0].decode("utf-8")
 
-    rgx = re.compile(r"(?:(?P<inner_dict>.*?):)?(?P<key>.*?)\=(?P<value>.*?)$")
     info = {}
 
     if sys.platform == 'win32':
@@ -352,7 +401,7 @@ def mediainfo(filepath):
 
     for line in output.split("\n"):
         # print(line)
-        mobj = rgx.match(line)
+        mobj = _MEDIAINFO_RGX.match(line)
 
         if mobj:
             # print(mobj.groups())
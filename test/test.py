@@ -1,5 +1,8 @@
 from functools import partial
+import array
 import os
+import pickle
+import random
 import sys
 import unittest
 from tempfile import (
@@ -15,11 +18,15 @@ from pydub.audio_segment import extract_wav_headers
 from pydub.utils import (
     db_to_float,
     ratio_to_db,
+    get_array_type,
     make_chunks,
+    iter_chunks,
     mediainfo,
     get_encoder_name,
     get_supported_decoders,
     get_supported_encoders,
+    which,
+    _cache_clear,
 )
 from pydub.exceptions import (
     InvalidTag,
@@ -28,10 +35,13 @@ from pydub.exceptions import (
     CouldntDecodeError,
     MissingAudioParameter,
 )
+from pydub import silence
 from pydub.silence import (
     detect_silence,
+    detect_leading_silence,
     split_on_silence,
 )
+from pydub import pyaudioop
 from pydub.generators import (
     Sine,
     Square,
@@ -41,6 +51,16 @@ from pydub.generators import (
     WhiteNoise,
 )
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import audioop
+except ImportError:
+    audioop = None
+
 data_dir = os.path.join(os.path.dirname(__file__), 'data')
 
 
@@ -58,6 +78,60 @@ class UtilityTests(unittest.TestCase):
         self.assertEqual(3, db_to_float(ratio_to_db(3, using_amplitude=False), using_amplitude=False))
         self.assertEqual(12, ratio_to_db(db_to_float(12, using_amplitude=False), using_amplitude=False))
 
+    def make_program(self, directory):
+        # which() looks for an .exe on windows
+        name = "pydub-test-program"
+        if os.name == "nt":
+            name += ".exe"
+        program = os.path.join(directory, name)
+        with open(program, "w") as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(program, 0o755)
+        return program
+
+    def test_which_is_cached_until_cleared(self):
+        path = os.environ["PATH"]
+        tmp_dir = tempfile.mkdtemp()
+        program = self.make_program(tmp_dir)
+        try:
+            os.environ["PATH"] = tmp_dir
+            self.assertEqual(which("pydub-test-program"), program)
+
+            # still found after removing it, until the cache is cleared
+            os.remove(program)
+            self.assertEqual(which("pydub-test-program"), program)
+            _cache_clear()
+            self.assertEqual(which("pydub-test-program"), None)
+        finally:
+            os.environ["PATH"] = path
+            _cache_clear()
+            os.rmdir(tmp_dir)
+
+    def test_which_follows_path_and_working_directory(self):
+        path = os.environ["PATH"]
+        cwd = os.getcwd()
+        tmp_dir = tempfile.mkdtemp()
+        program = self.make_program(tmp_dir)
+        try:
+            os.environ["PATH"] = cwd
+            self.assertEqual(which("pydub-test-program"), None)
+            os.environ["PATH"] = tmp_dir
+            self.assertEqual(which("pydub-test-program"), program)
+
+            os.environ["PATH"] = cwd
+            os.chdir(tmp_dir)
+            self.assertEqual(which("pydub-test-program"),
+                             os.path.join(os.curdir,
+                                          os.path.basename(program)))
+            os.chdir(cwd)
+            self.assertEqual(which("pydub-test-program"), None)
+        finally:
+            os.environ["PATH"] = path
+            os.chdir(cwd)
+            _cache_clear()
+            os.remove(program)
+            os.rmdir(tmp_dir)
+
 
 if sys.version_info >= (3, 6):
     class PathLikeObjectTests(unittest.TestCase):
@@ -163,6 +237,149 @@ if sys.version_info >= (3, 6):
                 os.unlink(path)
 
 
+@unittest.skipUnless(audioop, "audioop is not available")
+class PyAudioopTests(unittest.TestCase):
+
+    def setUp(self):
+        # every possible encoded byte
+        self.encoded = bytes(bytearray(range(256)))
+
+        rng = random.Random(0)
+        self.fragments = [
+            b'',
+            b'\x01\x80\xff\x7f',
+            bytes(bytearray(rng.getrandbits(8) for _ in range(1200))),
+            # full scale swings, for the clipping
+            b'\x7f\xff\xff\x7f\x00\x00\x00\x80' * 40 +
+            b'\x80\x00\x00\x80\xff\x7f\xff\xff' * 40,
+            # hovering around zero, for the sign changes
+            bytes(bytearray(rng.choice((0, 1, 255)) for _ in range(800))),
+        ]
+
+    def assertMatchesAudioop(self, fn_name):
+        for size in (1, 2, 4):
+            self.assertEqual(getattr(pyaudioop, fn_name)(self.encoded, size),
+                             getattr(audioop, fn_name)(self.encoded, size))
+
+    def assertMatchesAudioopWithAndWithoutNumpy(self, fn_name):
+        self.assertMatchesAudioop(fn_name)
+        self.without_numpy(self.assertMatchesAudioop, fn_name)
+
+    def without_numpy(self, fn, *args):
+        np = pyaudioop.np
+        pyaudioop.np = None
+        try:
+            return fn(*args)
+        finally:
+            pyaudioop.np = np
+
+    def assertMatchesAudioopCall(self, fn_name, *args):
+        expected = getattr(audioop, fn_name)(*args)
+        fn = getattr(pyaudioop, fn_name)
+        self.assertEqual(fn(*args), expected)
+        self.assertEqual(self.without_numpy(fn, *args), expected)
+
+    def test_ulaw2lin(self):
+        self.assertMatchesAudioopWithAndWithoutNumpy("ulaw2lin")
+
+    def test_alaw2lin(self):
+        self.assertMatchesAudioopWithAndWithoutNumpy("alaw2lin")
+
+    def test_fragment_measurements(self):
+        for cp in self.fragments:
+            for size in (1, 2, 4):
+                for fn_name in ("max", "minmax", "avg", "rms", "avgpp",
+                                "maxpp", "cross"):
+                    self.assertMatchesAudioopCall(fn_name, cp, size)
+                if cp:
+                    self.assertMatchesAudioopCall("getsample", cp, size, 0)
+
+    def test_fragment_arithmetic(self):
+        for cp in self.fragments:
+            for size in (1, 2, 4):
+                self.assertMatchesAudioopCall("reverse", cp, size)
+                self.assertMatchesAudioopCall("add", cp, cp[::-1], size)
+                for bias in (1, -1, 2 ** 31 - 1, -2 ** 31):
+                    self.assertMatchesAudioopCall("bias", cp, size, bias)
+                for factor in (0.5, 1, 2, -1.5, 0):
+                    self.assertMatchesAudioopCall("mul", cp, size, factor)
+                for fac1, fac2 in ((1, 0), (0, 1), (1, 1), (0.5, 0.5),
+                                   (2, -1)):
+                    self.assertMatchesAudioopCall("tostereo", cp, size,
+                                                  fac1, fac2)
+                    if len(cp) % (2 * size) == 0:
+                        self.assertMatchesAudioopCall("tomono", cp, size,
+                                                      fac1, fac2)
+
+    def test_findfit_findfactor_findmax(self):
+        for cp in self.fragments[1:]:
+            reference = cp[2 * (len(cp) // 8):2 * (len(cp) // 4)]
+            self.assertMatchesAudioopCall("findfit", cp, reference)
+            self.assertMatchesAudioopCall("findfactor", cp, cp[::-1])
+            for len2 in (1, 2, len(cp) // 4, len(cp) // 2):
+                self.assertMatchesAudioopCall("findmax", cp, len2)
+
+        # the first window is silent, so its cost is nan and never beaten
+        loud = self.fragments[2]
+        self.assertMatchesAudioopCall("findfit", b'\0' * 200 + loud,
+                                      loud[:100])
+
+    def test_lin2lin(self):
+        for size in (1, 2, 4):
+            for size2 in (1, 2, 4):
+                expected = audioop.lin2lin(self.encoded, size, size2)
+                self.assertEqual(pyaudioop.lin2lin(self.encoded, size, size2),
+                                 expected)
+                self.assertEqual(self.without_numpy(pyaudioop.lin2lin,
+                                                    self.encoded, size, size2),
+                                 expected)
+
+    def test_ratecv(self):
+        rng = random.Random(0)
+        cp = bytes(bytearray(rng.getrandbits(8) for _ in range(2400)))
+        for size in (1, 2, 4):
+            for nchannels in (1, 2):
+                for inrate, outrate in ((44100, 8000), (8000, 44100),
+                                        (22050, 48000)):
+                    for weightA, weightB in ((1, 0), (2, 1)):
+                        # the second call resumes from the first one's state
+                        state = None
+                        for fragment in (cp[:1200], cp[1200:]):
+                            args = (fragment, size, nchannels, inrate,
+                                    outrate, state, weightA, weightB)
+                            expected = audioop.ratecv(*args)
+                            self.assertEqual(pyaudioop.ratecv(*args),
+                                             expected)
+                            self.assertEqual(
+                                self.without_numpy(pyaudioop.ratecv, *args),
+                                expected)
+                            state = expected[1]
+
+    def test_ratecv_fragments_and_odd_rates(self):
+        rng = random.Random(1)
+        for size in (1, 2, 4):
+            frame = size * 3
+            cp = bytes(bytearray(rng.getrandbits(8)
+                                 for _ in range(frame * 37)))
+            # empty and single frame fragments have to carry the state over
+            # untouched or a frame at a time
+            fragments = [b'', cp[:frame], cp[frame:frame * 10], b'',
+                         cp[frame * 10:]]
+            for inrate, outrate in ((7, 3), (3, 7), (44100, 44100),
+                                    (1, 48000), (48000, 1)):
+                for weightA, weightB in ((1, 0), (1, 3), (5, 2)):
+                    state = None
+                    for fragment in fragments:
+                        args = (fragment, size, 3, inrate, outrate, state,
+                                weightA, weightB)
+                        expected = audioop.ratecv(*args)
+                        self.assertEqual(pyaudioop.ratecv(*args), expected)
+                        self.assertEqual(
+                            self.without_numpy(pyaudioop.ratecv, *args),
+                            expected)
+                        state = expected[1]
+
+
 class FileAccessTests(unittest.TestCase):
 
     def setUp(self):
@@ -432,6 +649,61 @@ class AudioSegmentTests(unittest.TestCase):
         self.assertEqual(len(seg_manual), 5000)
         self.assertEqual(len(seg_over), 5000)
 
+    @unittest.skipUnless(numpy is not None, "numpy not installed")
+    def test_overlay_numpy_matches_audioop(self):
+        from pydub import audio_segment
+
+        def overlay(seg, tile, **kwargs):
+            return seg.overlay(tile, **kwargs).raw_data
+
+        def overlay_without_numpy(seg, tile, **kwargs):
+            np = audio_segment.np
+            audio_segment.np = None
+            try:
+                return overlay(seg, tile, **kwargs)
+            finally:
+                audio_segment.np = np
+
+        rand = random.Random(5)
+
+        def loud_segment(sample_width, channels, duration):
+            # full scale noise at one frame per ms, so most sums saturate
+            limit = 2 ** (8 * sample_width - 1)
+            samples = [rand.randint(-limit, limit - 1)
+                       for _ in range(duration * channels)]
+            return AudioSegment(array.array(get_array_type(8 * sample_width), samples),
+                                sample_width=sample_width, channels=channels,
+                                frame_rate=1000)
+
+        cases = [dict(), dict(position=250), dict(position=-700),
+                 dict(times=3, position=40), dict(loop=True, position=13),
+                 dict(gain_during_overlay=-6), dict(loop=True, gain_during_overlay=3)]
+
+        # small blocks and threads on any machine, so short segments still
+        # cover the blockwise and threaded mixing
+        saved = (audio_segment._OVERLAY_BLOCK, audio_segment._PARALLEL_MIN_BYTES,
+                 audio_segment._cpu_count, audio_segment._executor)
+        try:
+            for block, threads in ((saved[0], 1), (64, 1), (64, 3)):
+                audio_segment._OVERLAY_BLOCK = block
+                audio_segment._PARALLEL_MIN_BYTES = 0
+                audio_segment._cpu_count = lambda: threads
+                for sample_width in (1, 2, 4):
+                    for channels in (1, 2):
+                        seg = loud_segment(sample_width, channels, 1500)
+                        for tile_len in (70, 1000):
+                            tile = loud_segment(sample_width, channels, tile_len)
+                            for kwargs in cases:
+                                self.assertEqual(overlay(seg, tile, **kwargs),
+                                                 overlay_without_numpy(seg, tile, **kwargs),
+                                                 (block, threads, sample_width, channels,
+                                                  tile_len, kwargs))
+        finally:
+            if audio_segment._executor is not saved[3]:
+                audio_segment._executor.shutdown()
+            (audio_segment._OVERLAY_BLOCK, audio_segment._PARALLEL_MIN_BYTES,
+             audio_segment._cpu_count, audio_segment._executor) = saved
+
     def test_slicing(self):
         empty = self.seg1[:0]
         second_long_slice = self.seg1[:1000]
@@ -450,6 +722,23 @@ class AudioSegmentTests(unittest.TestCase):
         past_end = second_long_slice[:1500]
         self.assertTrue(second_long_slice._data == past_end._data)
 
+    def test_subclass_init_runs_for_derived_segments(self):
+        class TaggedSegment(AudioSegment):
+            def __init__(self, *args, **kwargs):
+                super(TaggedSegment, self).__init__(*args, **kwargs)
+                self.tag = "tagged"
+
+        seg = TaggedSegment(self.seg1[:1000].raw_data,
+                            metadata={'sample_width': self.seg1.sample_width,
+                                      'frame_rate': self.seg1.frame_rate,
+                                      'frame_width': self.seg1.frame_width,
+                                      'channels': self.seg1.channels})
+        derived = [seg[:500], next(seg[::250]), seg + 3, seg.overlay(seg),
+                   seg.set_channels(1)]
+        for derived_seg in derived:
+            self.assertTrue(isinstance(derived_seg, TaggedSegment))
+            self.assertEqual(derived_seg.tag, "tagged")
+
     def test_slicing_by_step(self):
         audio = self.seg1[:10000]
         chunks = audio[:0]
@@ -723,6 +1012,10 @@ class AudioSegmentTests(unittest.TestCase):
             percentage=0.0001
         )
 
+    def test_normalize_already_normalized(self):
+        normalized = self.seg1.normalize(0.0)
+        self.assertIs(normalized.normalize(0.0), normalized)
+
     def test_for_accidental_shortening(self):
         seg = self.mp3_seg_party
         with NamedTemporaryFile('w+b', suffix='.mp3') as tmp_mp3_file:
@@ -762,6 +1055,47 @@ class AudioSegmentTests(unittest.TestCase):
         wav = AudioSegment.from_wav(wav_file)
         self.assertEqual(wav.duration_seconds, self.seg1.duration_seconds)
 
+    def test_lengths_follow_frame_rate_changes(self):
+        seg = AudioSegment(b'\0' * 8000 * 4, sample_width=2, channels=2,
+                           frame_rate=8000)
+        self.assertEqual(len(seg), 1000)
+
+        seg.frame_rate = 4000
+        self.assertEqual(len(seg), 2000)
+        self.assertEqual(seg.duration_seconds, 2.0)
+        self.assertEqual(seg.frame_count(ms=500), 2000)
+        self.assertEqual(len(seg[:500]), 500)
+
+        seg.frame_width = 2
+        self.assertEqual(seg.frame_count(), 16000)
+
+        seg.frame_rate = 0
+        self.assertEqual(len(seg), 0)
+        self.assertEqual(seg.duration_seconds, 0.0)
+
+    def test_unpickle(self):
+        seg = AudioSegment(b'\0' * 8000 * 4, sample_width=2, channels=2,
+                           frame_rate=8000)
+        seg = pickle.loads(pickle.dumps(seg, 2))
+        self.assertEqual(len(seg), 1000)
+        self.assertEqual(seg.frame_count(), 8000)
+
+        # a stereo 16-bit segment with two frames at 4Hz, pickled before
+        # frame_rate and frame_width became properties
+        old_pickle = (
+            b'\x80\x02cpydub.audio_segment\nAudioSegment\nq\x00)\x81q\x01}q'
+            b'\x02(X\x0c\x00\x00\x00sample_widthq\x03K\x02X\n\x00\x00\x00'
+            b'frame_rateq\x04K\x04X\x08\x00\x00\x00channelsq\x05K\x02X\x0b'
+            b'\x00\x00\x00frame_widthq\x06K\x04X\x05\x00\x00\x00_dataq\x07c'
+            b'_codecs\nencode\nq\x08X\x08\x00\x00\x00\x01\x00\x02\x00\x03'
+            b'\x00\x04\x00q\tX\x06\x00\x00\x00latin1q\n\x86q\x0bRq\x0cub.')
+        seg = pickle.loads(old_pickle)
+        self.assertEqual(len(seg), 500)
+        self.assertEqual(seg.frame_rate, 4)
+        self.assertEqual(seg.frame_width, 4)
+        self.assertEqual(seg.frame_count(), 2)
+        self.assertEqual(seg.raw_data, b'\x01\x00\x02\x00\x03\x00\x04\x00')
+
     @unittest.skipUnless('aac' in get_supported_decoders(),
                          "Unsupported codecs")
     def test_autodetect_format(self):
@@ -943,6 +1277,13 @@ class AudioSegmentTests(unittest.TestCase):
             seg2 += chunk
         self.assertEqual(len(seg), len(seg2))
 
+    def test_iter_chunks(self):
+        seg = self.seg1
+        chunks = iter_chunks(seg, 100)
+        self.assertFalse(isinstance(chunks, list))
+        self.assertEqual([chunk.raw_data for chunk in chunks],
+                         [chunk.raw_data for chunk in make_chunks(seg, 100)])
+
     def test_empty(self):
         self.assertEqual(len(self.seg1), len(self.seg1 + AudioSegment.empty()))
         self.assertEqual(len(self.seg2), len(self.seg2 + AudioSegment.empty()))
@@ -973,6 +1314,33 @@ class AudioSegmentTests(unittest.TestCase):
         # average volume should be reduced
         self.assertTrue(compressed.rms < self.seg1.rms)
 
+    @unittest.skipUnless(numpy is not None, "numpy not installed")
+    def test_compress_numpy_matches_frame_loop(self):
+        from pydub import effects
+
+        def compress_without_numpy(seg, **kwargs):
+            np = effects.np
+            effects.np = None
+            try:
+                return seg.compress_dynamic_range(**kwargs)
+            finally:
+                effects.np = np
+
+        seg = self.seg1[5000:6500]
+        self.assertEqual(seg.channels, 2)
+        cases = [
+            (seg, {}),
+            (seg.set_sample_width(1), {}),
+            (seg, {'attack': 1, 'release': 20}),
+            (seg.set_sample_width(1), {'attack': 1, 'release': 20}),
+        ]
+        for s, kwargs in cases:
+            expected = compress_without_numpy(s, **kwargs)
+            compressed = s.compress_dynamic_range(**kwargs)
+            self.assertNotEqual(expected.raw_data, s.raw_data)
+            self.assertEqual(compressed.sample_width, s.sample_width)
+            self.assertEqual(compressed.raw_data, expected.raw_data)
+
     @unittest.skipUnless('aac' in get_supported_decoders(),
                          "Unsupported codecs")
     def test_exporting_to_ogg_uses_default_codec_when_codec_param_is_none(self):
@@ -1051,6 +1419,18 @@ class AudioSegmentTests(unittest.TestCase):
             [0, 2099, 4190, 6263, 8311, 10325, 12296, 14217]
         )
 
+    @unittest.skipUnless(numpy is not None, "numpy not installed")
+    def test_samples_numpy(self):
+        seg = Sine(450).to_audio_segment()
+        samples = seg.get_samples_numpy()
+        self.assertEqual(samples.dtype, numpy.int16)
+        self.assertEqual(list(samples[:8]), list(seg.get_array_of_samples()[:8]))
+
+        stereo = AudioSegment.from_mono_audiosegments(seg, seg.invert_phase())
+        samples = stereo.get_samples_numpy()
+        self.assertEqual(samples.shape, (int(stereo.frame_count()), 2))
+        self.assertEqual(list(samples[:4, 1]), [0, -2099, -4190, -6263])
+
     def test_get_dc_offset(self):
         seg = self.seg_dc_offset
         self.assertWithinTolerance(seg.get_dc_offset(), -0.16, tolerance=0.01)
@@ -1153,6 +1533,137 @@ class SilenceTests(unittest.TestCase):
             self.assertTrue(start > prev_end)
             prev_end = end
 
+    def random_segment(self, rand, sample_width, channels, frame_rate=8000,
+                       duration=1500):
+        # random samples that switch between silence, quiet and loud every
+        # few ms, so there are plenty of slices either side of a threshold
+        max_val = 2 ** (8 * sample_width - 1) - 1
+        sample_count = frame_rate * duration // 1000 * channels
+        samples = []
+        while len(samples) < sample_count:
+            amplitude = rand.choice([0, 3, max_val // 100, max_val])
+            run = rand.randint(1, frame_rate // 10) * channels
+            samples.extend(rand.randint(-amplitude, amplitude) for _ in range(run))
+
+        data = array.array(get_array_type(sample_width * 8), samples[:sample_count])
+        return AudioSegment(data, sample_width=sample_width, channels=channels,
+                            frame_rate=frame_rate)
+
+    def exact_thresholds(self, seg, positions, length):
+        # thresholds sitting exactly on the rms of a few slices
+        thresholds = [-30, -60]
+        for position in positions:
+            rms = seg[position:position + length].rms
+            if rms:
+                thresholds.append(ratio_to_db(rms / seg.max_possible_amplitude))
+        return thresholds
+
+    def without_numpy(self, fn, *args):
+        np = silence.np
+        silence.np = None
+        try:
+            return fn(*args)
+        finally:
+            silence.np = np
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_detect_silence_numpy_matches_audioop(self):
+        rand = random.Random(1)
+        for sample_width in (1, 2, 4):
+            for channels in (1, 2):
+                seg = self.random_segment(rand, sample_width, channels)
+                for min_silence_len in (5, 10, 300):
+                    thresholds = self.exact_thresholds(seg, [0, 200, 700],
+                                                       min_silence_len)
+                    # overlapping and non-overlapping slices
+                    for seek_step in (1, 7, min_silence_len, min_silence_len + 3):
+                        for silence_thresh in thresholds:
+                            args = (seg, min_silence_len, silence_thresh, seek_step)
+                            self.assertEqual(detect_silence(*args),
+                                             self.without_numpy(detect_silence, *args),
+                                             args[1:] + (sample_width, channels))
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_detect_leading_silence_numpy_matches_audioop(self):
+        rand = random.Random(2)
+        for sample_width in (1, 2, 4):
+            for channels in (1, 2):
+                seg = self.random_segment(rand, sample_width, channels)
+                # chunks of 8 and 80 frames are checked with arrays, 400 not
+                for chunk_size in (1, 10, 50):
+                    thresholds = self.exact_thresholds(seg, [0, 100, 500], chunk_size)
+                    for silence_threshold in thresholds:
+                        # what detect_leading_silence is defined as
+                        trim_ms = 0
+                        while seg[trim_ms:trim_ms + chunk_size].dBFS < silence_threshold \
+                                and trim_ms < len(seg):
+                            trim_ms += chunk_size
+                        expected = min(trim_ms, len(seg))
+
+                        args = (seg, silence_threshold, chunk_size)
+                        msg = args[1:] + (sample_width, channels)
+                        self.assertEqual(detect_leading_silence(*args), expected, msg)
+                        self.assertEqual(self.without_numpy(detect_leading_silence, *args),
+                                         expected, msg)
+
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_sliding_silence_matches_audioop_slices(self):
+        rand = random.Random(3)
+        for sample_width in (1, 2):
+            for channels in (1, 2):
+                seg = self.random_segment(rand, sample_width, channels)
+                for slice_len in (5, 40):
+                    starts = numpy.arange(0, len(seg) - slice_len + 1, 3)
+                    for thresh in self.exact_thresholds(seg, [0, 300, 900],
+                                                        slice_len):
+                        thresh = db_to_float(thresh) * seg.max_possible_amplitude
+                        expected = numpy.isin(starts, silence._silent_slice_starts(
+                            seg, starts.tolist(), slice_len, thresh))
+
+                        silent = silence._sliding_silence(seg, starts,
+                                                          slice_len, thresh)
+                        self.assertEqual(silent.tolist(), expected.tolist())
+
+                        # the blocks alone may leave slices undecided, but
+                        # never decide one wrongly
+                        frames = silence._slice_frames(seg, starts,
+                                                       starts + slice_len)
+                        silent, loud = silence._silent_or_loud_by_blocks(
+                            seg, *frames + (thresh,))
+                        self.assertFalse((silent & ~expected).any())
+                        self.assertFalse((loud & expected).any())
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_sums_of_squares_between(self):
+        rand = random.Random(4)
+        samples = numpy.array([rand.randint(-32768, 32767) for _ in range(5000)],
+                              dtype=numpy.int16)
+        # forward moving slices that overlap, abut and jump ahead
+        starts, ends, position = [], [], 0
+        while position < 4900:
+            length = rand.choice([0, 1, 5, 30, 100, 400])
+            starts.append(position)
+            ends.append(min(position + length, len(samples)))
+            position += rand.choice([0, 1, 10, 50, 300])
+        starts, ends = numpy.array(starts), numpy.array(ends)
+        order = numpy.array(rand.sample(range(len(starts)), len(starts)))
+        # a sliding window, like detect_silence's
+        window_starts = numpy.arange(0, 4600, 7)
+
+        # small spans and blocks, so the slices go through several of each
+        span, block = silence._SUMS_SPAN, silence._SQUARES_BLOCK
+        silence._SUMS_SPAN, silence._SQUARES_BLOCK = 256, 64
+        try:
+            for starts, ends in ((starts, ends), (starts[order], ends[order]),
+                                 (window_starts, window_starts + 400)):
+                expected = [sum(int(sample) ** 2 for sample in samples[start:end])
+                            for start, end in zip(starts, ends)]
+                self.assertEqual(
+                    silence._sums_of_squares_between(samples, starts, ends).tolist(),
+                    expected)
+        finally:
+            silence._SUMS_SPAN, silence._SQUARES_BLOCK = span, block
 
 class GeneratorTests(unittest.TestCase):
 
@@ -1184,6 +1695,37 @@ class GeneratorTests(unittest.TestCase):
         self.assertAlmostEqual(len(five_sec), 5000)
         self.assertAlmostEqual(len(half_sec), 500)
 
+    @unittest.skipUnless(numpy is not None, "numpy not installed")
+    def test_numpy_samples_match_generate(self):
+        from pydub import generators
+
+        def to_audio_segment(generator, seed, **kwargs):
+            random.seed(seed)
+            return generator.to_audio_segment(**kwargs).raw_data
+
+        signals = [
+            Sine(440),
+            Sine(441, sample_rate=8000, bit_depth=8),
+            Square(441),
+            Pulse(440, duty_cycle=0.3, bit_depth=32),
+            Triangle(440),
+            Sawtooth(440, duty_cycle=0.75, sample_rate=22050),
+            Sawtooth(440, duty_cycle=0.0),
+            Sawtooth(441, duty_cycle=1.0, bit_depth=8),
+            WhiteNoise(),
+        ]
+        for seed, generator in enumerate(signals):
+            for volume in (0.0, -3.0):
+                kwargs = dict(duration=250, volume=volume)
+                np = generators.np
+                generators.np = None
+                try:
+                    expected = to_audio_segment(generator, seed, **kwargs)
+                finally:
+                    generators.np = np
+                self.assertEqual(to_audio_segment(generator, seed, **kwargs),
+                                 expected)
+
 
 class NoConverterTests(unittest.TestCase):
 
@@ -1324,6 +1866,24 @@ class FilterTests(unittest.TestCase):
         less_treble = s.low_pass_filter(400)
         self.assertTrue(less_treble.dBFS < s.dBFS)
 
+    def test_scipy_lowpass_filter_saturates_instead_of_wrapping(self):
+        try:
+            from pydub import scipy_effects
+        except ImportError:
+            raise unittest.SkipTest("scipy is not installed")
+
+        # a full scale square wave rings past full scale after the filter
+        s = Square(200).to_audio_segment(duration=500)
+        filtered = scipy_effects.low_pass_filter(s, 400).get_array_of_samples()
+
+        # the ringing is clipped at the sample limits...
+        self.assertEqual(max(filtered), 32767)
+        self.assertEqual(min(filtered), -32768)
+        # ...so the signal never jumps to the other sign by wrapping around
+        self.assertTrue(all(abs(b - a) < 0x8000
+                            for a, b in zip(filtered, filtered[1:])))
+        self.assertEqual(len(filtered), len(s.get_array_of_samples()))
+
     def test_lowpass_filter_cutoff_frequency(self):
         # A Sine wave should not be affected by a LPF 3 octaves Higher
         s = Sine(100).to_audio_segment()